@@ -1,6 +1,8 @@
 import yaml
 import logging
 from .buisness_structure_agent_helper import BusinessStructureAgentHelper
+from ..results import BusinessStructureAnalysis
+from ..rendering import render_markdown
 
 
 class BusinessStructureAgent:
@@ -13,7 +15,10 @@ class BusinessStructureAgent:
         llama_api_key = config['agents']['business_structure_agent']['llama_api_key']
 
         # Initialize helper functions
-        self.helper = BusinessStructureAgentHelper(llama_api_key=llama_api_key)
+        self.helper = BusinessStructureAgentHelper(llama_api_key=llama_api_key, llm_config=config.get('llm'))
+
+        # Ask for independent sections in one request when enabled
+        self.fused_sections = (config.get('llm') or {}).get('fused_sections', False)
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -31,50 +36,40 @@ class BusinessStructureAgent:
             business_model_type = input_data.get('business_model_type', 'Standard')  # e.g., Subscription, Freemium
             company_size = input_data.get('company_size', 'Startup')  # e.g., Startup, Small, Medium, Large
 
+            # Fetch independent sections in one round trip when fused mode is enabled
+            fused = (self.helper.fetch_sections_fused(industry, business_model_type, company_size)
+                     if self.fused_sections else {})
+
             # Propose business models
-            proposed_models = self.helper.propose_business_models(industry, business_model_type)
+            proposed_models = (fused.get('proposed_business_models')
+                               or self.helper.propose_business_models(industry, business_model_type))
 
             # Map organizational structure
-            organizational_structure = self.helper.map_organizational_structure(company_size)
+            organizational_structure = (fused.get('organizational_structure')
+                                        or self.helper.map_organizational_structure(company_size))
 
             # Plan scalability
             scalability_plan = self.helper.plan_scalability(business_model_type, organizational_structure)
 
             # Compile the analysis
-            analysis = {
-                "proposed_business_models": proposed_models,
-                "organizational_structure": organizational_structure,
-                "scalability_plan": scalability_plan
-            }
-
-            # Format the analysis into a readable string
-            formatted_analysis = self.format_analysis(analysis)
+            analysis = BusinessStructureAnalysis(
+                proposed_business_models=proposed_models,
+                organizational_structure=organizational_structure,
+                scalability_plan=scalability_plan
+            )
 
             self.logger.info("Business structure analysis completed successfully.")
-            return formatted_analysis
+            return analysis
         except Exception as e:
             self.logger.error(f"Error during business structure analysis: {e}")
             return "An error occurred during business structure analysis."
 
     def format_analysis(self, analysis):
         """
-        Formats the analysis dictionary into a readable string.
+        Formats the analysis result into a readable Markdown string.
         """
         try:
-            formatted = "**Proposed Business Models:**\n"
-            formatted += f"{analysis['proposed_business_models']}\n"
-            # for idx, model in enumerate(analysis['proposed_business_models'], 1):
-            #     formatted += f"{idx}. {model}\n"
-
-            formatted += "\n**Organizational Structure:**\n"
-            formatted += f"{analysis['organizational_structure']}\n"
-            # for role, responsibility in analysis['organizational_structure'].items():
-            #     formatted += f"- **{role}**: {responsibility}\n"
-
-            formatted += "\n**Scalability Plan:**\n"
-            formatted += f"{analysis['scalability_plan']}\n"
-
-            return formatted
+            return render_markdown(analysis)
         except Exception as e:
             self.logger.error(f"Error formatting analysis: {e}")
             return "Unable to format business structure analysis at this time."
@@ -3,40 +3,23 @@
 import logging
 import json
 from groq import Groq  # Assuming Groq library provides a client named GroqClient
+from llm.router import LlamaRouter
+from llm.fused import request_fused_sections
 
 
 class BusinessStructureAgentHelper:
-    def __init__(self, llama_api_key, llama_endpoint='https://grqoclound.api/llama'):
+    def __init__(self, llama_api_key, llama_endpoint='https://grqoclound.api/llama', llm_config=None):
         self.logger = logging.getLogger(__name__)
         self.llama_endpoint = llama_endpoint
         self.client = Groq(api_key=self.llama_api_key)
+        self.router = LlamaRouter(self.client, llm_config, agent='BusinessStructure')
 
-    def send_prompt_to_llama(self, prompt, max_tokens=500, temperature=0.7):
-            """
-            Sends a prompt to the Llama model via GroqClient and retrieves the response.
-            """
-            try:
-                # Wrapping the prompt in a list of dictionaries as required by Groq's API
-                messages = [{"role": "user", "content": prompt}]
-                completion = self.client.chat.completions.create(
-                    model="llama3-8b-8192",
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    top_p=1,
-                    stream=True
-                )
-
-                # Collecting the streamed response
-                response_text = ""
-                for chunk in completion:
-                    response_text += chunk.choices[0].delta.content or ""
-
-                return response_text.strip()
+    def send_prompt_to_llama(self, prompt, route='default', max_tokens=None, temperature=None):
+        """
+        Sends a prompt to the Llama model configured for the route and retrieves the response.
+        """
+        return self.router.send(route, prompt, max_tokens=max_tokens, temperature=temperature)
 
-            except Exception as e:
-                self.logger.error(f"Error sending prompt to Llama via Groq: {e}")
-                return None
     def propose_business_models(self, industry, business_model_type):
         """
         Proposes suitable business models based on the industry and specified type using Llama via Groq.
@@ -45,8 +28,8 @@ class BusinessStructureAgentHelper:
             f"Propose suitable business models for a startup in the {industry} industry using a {business_model_type} model. Provide the models as a JSON array of strings. Return only the json object nothing else"
         )
 
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='propose_business_models')
+        return response or "Unable to propose business models at this time."
         # if response:
         #     try:
         #         models = json.loads(response)
@@ -64,8 +47,8 @@ class BusinessStructureAgentHelper:
         prompt = (
             f"Map an organizational structure for a company of size '{company_size}'. Provide the structure as a JSON object where keys are roles and values are their responsibilities. Return only the json object nothing else"
         )
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='map_organizational_structure')
+        return response or "Unable to map organizational structure at this time."
         # if response:
         #     try:
         #         structure = json.loads(response)
@@ -85,9 +68,32 @@ class BusinessStructureAgentHelper:
         prompt = (
             f"Plan scalability strategies for a business using the '{business_model}' model and the following organizational structure:\n\n '{current_structure_json}' \n\n Provide the scalability plan as a detailed paragraph."
         )
-        response = self.send_prompt_to_llama(prompt, max_tokens=300)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='plan_scalability')
+        return response or "Unable to plan scalability at this time."
         # if response:
         #     return response
         # else:
         #     return "Unable to plan scalability at this time."
+
+    def fetch_sections_fused(self, industry, business_model_type, company_size):
+        """
+        Proposes business models and maps the organizational structure in a single request.
+
+        Returns:
+            dict: Parsed sections keyed by 'proposed_business_models' and 'organizational_structure'
+                for every section that passed validation.
+        """
+        context = (
+            f"You are designing a startup in the {industry} industry using a {business_model_type} model, at company size '{company_size}'."
+        )
+        sections = {
+            "proposed_business_models": (
+                f"a JSON array of strings proposing suitable business models for a {business_model_type} startup in the {industry} industry",
+                list
+            ),
+            "organizational_structure": (
+                f"a JSON object mapping an organizational structure for a company of size '{company_size}', where keys are roles and values are their responsibilities",
+                dict
+            ),
+        }
+        return request_fused_sections(self.send_prompt_to_llama, 'fused_business_structure', context, sections)
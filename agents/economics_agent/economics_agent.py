@@ -3,6 +3,8 @@
 import yaml
 import logging
 from .economics_agent_helper import EconomicsAgentHelper
+from ..results import EconomicAnalysis
+from ..rendering import render_markdown
 
 
 class EconomicsAgent:
@@ -15,7 +17,10 @@ class EconomicsAgent:
         llama_api_key = config['agents']['economics_agent']['llama_api_key']
 
         # Initialize helper functions
-        self.helper = EconomicsAgentHelper(llama_api_key_env_var='ECONOMICS_AGENT_API_KEY')
+        self.helper = EconomicsAgentHelper(llama_api_key_env_var='ECONOMICS_AGENT_API_KEY', llm_config=config.get('llm'))
+
+        # Ask for independent sections in one request when enabled
+        self.fused_sections = (config.get('llm') or {}).get('fused_sections', False)
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -32,24 +37,25 @@ class EconomicsAgent:
             industry = input_data.get('industry', 'General')
             business_model = input_data.get('business_model', 'Standard')  # e.g., Subscription, Freemium
 
+            # Fetch independent sections in one round trip when fused mode is enabled
+            fused = self.helper.fetch_sections_fused(industry, business_model) if self.fused_sections else {}
+
             # Fetch market data
-            market_data = self.helper.fetch_market_data(industry)
+            market_data = fused.get('market_data') or self.helper.fetch_market_data(industry)
             # Generate financial projections
-            financial_projections = self.helper.generate_financial_projections(business_model)
+            financial_projections = (fused.get('financial_projections')
+                                     or self.helper.generate_financial_projections(business_model))
 
             # Conduct competitive analysis
-            competitive_analysis = self.helper.conduct_competitive_analysis(industry)
+            competitive_analysis = (fused.get('competitive_analysis')
+                                    or self.helper.conduct_competitive_analysis(industry))
 
             # Compile the analysis
-            analysis = {
-                "market_data": market_data,
-                "financial_projections": financial_projections,
-                "competitive_analysis": competitive_analysis
-            }
-
-
-            # Format the analysis into a readable string
-            formatted_analysis = self.format_analysis(analysis)
+            analysis = EconomicAnalysis(
+                market_data=market_data,
+                financial_projections=financial_projections,
+                competitive_analysis=competitive_analysis
+            )
 
             self.logger.info("Economic analysis completed successfully.")
             return analysis
@@ -59,60 +65,10 @@ class EconomicsAgent:
 
     def format_analysis(self, analysis):
         """
-        Formats the analysis dictionary into a readable string.
+        Formats the analysis result into a readable Markdown string.
         """
         try:
-            formatted = "**Market Data:**\n"
-
-            # Format market size
-            market_size = analysis['market_data'].get('market_size', {})
-            formatted += f"Market Size (Global): {market_size.get('value', 'N/A')}\n"
-            if 'segmentation' in market_size:
-                formatted += "Segmentation:\n"
-                for segment, value in market_size['segmentation'].items():
-                    formatted += f"  - {segment.capitalize()}: {value}\n"
-
-            # Format growth rate
-            growth_rate = analysis['market_data'].get('growth_rate', {})
-            formatted += f"Growth Rate (Global): {growth_rate.get('value', 'N/A')}\n"
-            if 'segmentation' in growth_rate:
-                formatted += "Segmentation:\n"
-                for segment, value in growth_rate['segmentation'].items():
-                    formatted += f"  - {segment.capitalize()}: {value}\n"
-
-            # Format key trends
-            formatted += "Key Trends:\n"
-            for trend in analysis['market_data'].get('key_trends', []):
-                formatted += f"  - {trend}\n"
-
-            # Format major players
-            formatted += "Major Players:\n"
-            for player in analysis['market_data'].get('major_players', []):
-                formatted += f"  - {player}\n"
-
-            # # Format financial projections
-            formatted += "\n**Financial Projections:**\n"
-            formatted += f"\n{analysis['financial_projections']} \n"
-            # for year, projections in analysis['financial_projections'].items():
-            #     formatted += f"{year}:\n"
-            #     for key, value in projections.items():
-            #         formatted += f"  - {key}: {value}\n"
-
-            # Format competitive analysis
-            formatted += "\n**Competitive Analysis:**\n"
-            formatted += f"\n{analysis['competitive_analysis']} \n"
-            # for competitor in analysis['competitive_analysis']:
-            #     formatted += f"- **{competitor.get('Name', 'N/A')}**\n"
-            #     formatted += f"  - Market Share: {competitor.get('Market Share', 'N/A')}\n"
-            #     formatted += "  - Strengths:\n"
-            #     for strength in competitor.get('Strengths', []):
-            #         formatted += f"    - {strength}\n"
-            #     formatted += "  - Weaknesses:\n"
-            #     for weakness in competitor.get('Weaknesses', []):
-            #         formatted += f"    - {weakness}\n"
-            #
-            # return formatted.strip()
-
+            return render_markdown(analysis)
         except Exception as e:
             self.logger.error(f"Error formatting analysis: {e}")
             return "Unable to format economic analysis at this time."
@@ -4,10 +4,13 @@ import logging
 import json
 import os
 from groq import Groq  # Assuming Groq library provides a client named GroqClient
+from llm.router import LlamaRouter
+from llm.fused import request_fused_sections
 
 
 class EconomicsAgentHelper:
-    def __init__(self, llama_api_key_env_var='ECONOMICS_AGENT_API_KEY', llama_endpoint='https://grqoclound.api/llama'):
+    def __init__(self, llama_api_key_env_var='ECONOMICS_AGENT_API_KEY', llama_endpoint='https://grqoclound.api/llama',
+                 llm_config=None):
         self.logger = logging.getLogger(__name__)
         self.llama_endpoint = llama_endpoint
 
@@ -16,33 +19,14 @@ class EconomicsAgentHelper:
             raise ValueError(f"Environment variable {llama_api_key_env_var} not set.")
 
         self.client = Groq(api_key=self.llama_api_key)
+        self.router = LlamaRouter(self.client, llm_config, agent='Economics')
 
-    def send_prompt_to_llama(self, prompt, max_tokens=500, temperature=0.7):
-            """
-            Sends a prompt to the Llama model via GroqClient and retrieves the response.
-            """
-            try:
-                # Wrapping the prompt in a list of dictionaries as required by Groq's API
-                messages = [{"role": "user", "content": prompt}]
-                completion = self.client.chat.completions.create(
-                    model="llama3-8b-8192",
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    top_p=1,
-                    stream=True
-                )
-
-                # Collecting the streamed response
-                response_text = ""
-                for chunk in completion:
-                    response_text += chunk.choices[0].delta.content or ""
-
-                return response_text.strip()
+    def send_prompt_to_llama(self, prompt, route='default', max_tokens=None, temperature=None):
+        """
+        Sends a prompt to the Llama model configured for the route and retrieves the response.
+        """
+        return self.router.send(route, prompt, max_tokens=max_tokens, temperature=temperature)
 
-            except Exception as e:
-                self.logger.error(f"Error sending prompt to Llama via Groq: {e}")
-                return None
     def fetch_market_data(self, industry):
         """
         Fetches relevant market data based on the startup's industry using Llama via Groq.
@@ -50,8 +34,8 @@ class EconomicsAgentHelper:
         prompt = (
             f"Provide a detailed overview of the market for the {industry} industry. Include current market size, projected growth rates, key trends, and major players. Format the response as a JSON object with the following keys: 'market_size', 'growth_rate', 'key_trends', 'major_players'. Return only the json object nothing else"
         )
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='fetch_market_data')
+        return response or "Unable to fetch market data at this time."
         # if response:
         #     try:
         #         market_data = json.loads(response)
@@ -79,8 +63,8 @@ class EconomicsAgentHelper:
         prompt = (
             f"Generate a three-year financial projection for a startup using the '{business_model}' business model. Include projected revenues, expenses, and profits for each year. Format the response as a JSON object with years as keys and sub-keys 'Revenue', 'Expenses', and 'Profit'. Return only the json object nothing else. i repeat return only the json object nothing else",
         )
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='generate_financial_projections')
+        return response or "Unable to generate financial projections at this time."
         # if response:
         #     try:
         #         projections = json.loads(response)
@@ -99,8 +83,8 @@ class EconomicsAgentHelper:
             f"Conduct a competitive analysis for the {industry} industry. Identify 3 key competitors, their market shares, strengths, and weaknesses. Format the response as a JSON array of objects, each containing 'Name', 'Market Share', 'Strengths', and 'Weaknesses'. Return only the json object nothing else"
         )
 
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='conduct_competitive_analysis')
+        return response or "Unable to conduct competitive analysis at this time."
 
         # if response:
         #     try:
@@ -111,3 +95,30 @@ class EconomicsAgentHelper:
         #         return [{"Error": "Unable to conduct competitive analysis at this time."}]
         # else:
         #     return [{"Error": "Unable to conduct competitive analysis at this time."}]
+
+    def fetch_sections_fused(self, industry, business_model):
+        """
+        Fetches market data, financial projections and competitive analysis in a single request.
+
+        Returns:
+            dict: Parsed sections keyed by 'market_data', 'financial_projections' and 'competitive_analysis'
+                for every section that passed validation.
+        """
+        context = (
+            f"You are an economic analyst for a startup in the {industry} industry using the '{business_model}' business model."
+        )
+        sections = {
+            "market_data": (
+                f"a JSON object describing the {industry} market with the keys 'market_size', 'growth_rate', 'key_trends', 'major_players'",
+                dict
+            ),
+            "financial_projections": (
+                f"a JSON object with a three-year financial projection for the '{business_model}' business model, with years as keys and sub-keys 'Revenue', 'Expenses', and 'Profit'",
+                dict
+            ),
+            "competitive_analysis": (
+                f"a JSON array of 3 key competitors in the {industry} industry, each an object containing 'Name', 'Market Share', 'Strengths', and 'Weaknesses'",
+                list
+            ),
+        }
+        return request_fused_sections(self.send_prompt_to_llama, 'fused_economics', context, sections)
@@ -15,7 +15,7 @@ class GeneralizedAgent:
         llama_api_key = config['agents']['generalized_agent']['llama_api_key']
 
         # Initialize helper functions
-        self.helper = GeneralizedAgentHelper(llama_api_key_env_var='GENERALIZED_AGENT_API_KEY')
+        self.helper = GeneralizedAgentHelper(llama_api_key_env_var='GENERALIZED_AGENT_API_KEY', llm_config=config.get('llm'))
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -1,14 +1,20 @@
 # agents/generalized_agent_helper.py
 
 import logging
-import json
 import os
 from groq import Groq  # Assuming Groq library provides a client named GroqClient
+from llm.router import LlamaRouter, estimate_tokens
+from llm.map_reduce import split_into_chunks, map_concurrently, reduce_until_fits
+from ..results import from_wire
+from ..rendering import render_markdown, render_sections
+
+# Outputs that are themselves reports; a previous run's report must not feed into the next one
+REPORT_SECTIONS = ('ComprehensiveReport', 'report')
 
 
 class GeneralizedAgentHelper:
     def __init__(self, llama_api_key_env_var='GENERALIZED_AGENT_API_KEY',
-                 llama_endpoint='https://grqoclound.api/llama'):
+                 llama_endpoint='https://grqoclound.api/llama', llm_config=None):
         self.logger = logging.getLogger(__name__)
         self.llama_endpoint = llama_endpoint
 
@@ -17,33 +23,21 @@ class GeneralizedAgentHelper:
             raise ValueError(f"Environment variable {llama_api_key_env_var} not set.")
 
         self.client = Groq(api_key=self.llama_api_key)
+        self.router = LlamaRouter(self.client, llm_config, agent='ComprehensiveReport')
+
+        # Map-reduce summarization settings; 'auto' switches to map-reduce when the input would not fit
+        summarization = (llm_config or {}).get('summarization', {})
+        self.summarization_mode = summarization.get('mode', 'auto')
+        self.context_tokens = summarization.get('context_tokens', 6000)
+        self.chunk_tokens = summarization.get('chunk_tokens', 2000)
+        self.max_workers = summarization.get('max_workers', 4)
+        self.max_depth = summarization.get('max_depth', 4)
 
-    def send_prompt_to_llama(self, prompt, max_tokens=500, temperature=0.7):
+    def send_prompt_to_llama(self, prompt, route='default', max_tokens=None, temperature=None):
         """
-        Sends a prompt to the Llama model via GroqClient and retrieves the response.
+        Sends a prompt to the Llama model configured for the route and retrieves the response.
         """
-        try:
-            # Wrapping the prompt in a list of dictionaries as required by Groq's API
-            messages = [{"role": "user", "content": prompt}]
-            completion = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                top_p=1,
-                stream=True
-            )
-
-            # Collecting the streamed response
-            response_text = ""
-            for chunk in completion:
-                response_text += chunk.choices[0].delta.content or ""
-
-            return response_text.strip()
-
-        except Exception as e:
-            self.logger.error(f"Error sending prompt to Llama via Groq: {e}")
-            return None
+        return self.router.send(route, prompt, max_tokens=max_tokens, temperature=temperature)
 
     def aggregate_data(self, storage, idea_id):
         """
@@ -57,23 +51,40 @@ class GeneralizedAgentHelper:
             dict: A dictionary containing aggregated data from all agents.
         """
         try:
-            data = storage.retrieve_outputs(idea_id)
+            data = {agent_type: from_wire(output) for agent_type, output in storage.retrieve_outputs(idea_id).items()}
             self.logger.info(f"Aggregated data for idea_id: {idea_id}")
             return data
         except Exception as e:
             self.logger.error(f"Error aggregating data: {e}")
             return {}
+    @staticmethod
+    def build_report_prompt(aggregated_markdown):
+        return (
+            f"Generate a comprehensive and cohesive report based on the following aggregated data:\n\n{aggregated_markdown}\n\n The report should include sections for Legal Analysis, Economic Analysis, and Business Structure Analysis. Each section should be well-formatted in Markdown with appropriate headings and subheadings."
+        )
+
     def summarize_data_with_llama(self, aggregated_data):
         """
         Summarizes the aggregated data using Llama via Groq.
+
+        Uses a single completion when the prompt fits ``context_tokens``, and map-reduce
+        summarization (``summarize_map_reduce``) otherwise or when configured to always do so.
         """
         try:
-            # Convert the aggregated_data dictionary to a formatted JSON string for inclusion in the prompt
-            aggregated_data_json = json.dumps(aggregated_data, indent=4)
-            prompt = (
-                f"Generate a comprehensive and cohesive report based on the following aggregated data:\n\n '{aggregated_data_json}'\n\n The report should include sections for Legal Analysis, Economic Analysis, and Business Structure Analysis. Each section should be well-formatted in Markdown with appropriate headings and subheadings."
-            )
-            response = self.send_prompt_to_llama(prompt)
+            sections = {
+                agent_type: output for agent_type, output in aggregated_data.items()
+                if agent_type not in REPORT_SECTIONS
+            }
+            # Render each agent's output as Markdown once instead of re-serializing it to JSON
+            aggregated_markdown = render_sections(sections)
+            prompt = self.build_report_prompt(aggregated_markdown)
+            prompt_tokens = estimate_tokens(prompt)
+            if self.summarization_mode == 'map_reduce' or (
+                    self.summarization_mode == 'auto' and prompt_tokens > self.context_tokens):
+                self.logger.info(f"Report input is ~{prompt_tokens} tokens; using map-reduce summarization.")
+                return self.summarize_map_reduce(sections)
+
+            response = self.send_prompt_to_llama(prompt, route='summarize_data')
             if response:
                 return response
             else:
@@ -82,6 +93,53 @@ class GeneralizedAgentHelper:
             self.logger.error(f"Error summarizing data with Llama: {e}")
             return "Unable to summarize data at this time."
 
+    def summarize_map_reduce(self, sections):
+        """
+        Summarizes each agent's output (in chunks) concurrently, then combines the partial summaries.
+
+        Partial summaries are combined level by level until they fit ``context_tokens``;
+        the final level goes through the regular report prompt.
+        """
+        chunks = [
+            (agent_type, chunk)
+            for agent_type, output in sections.items()
+            for chunk in split_into_chunks(render_markdown(output), self.chunk_tokens)
+        ]
+        partials = map_concurrently(lambda item: self.summarize_chunk(*item), chunks, self.max_workers)
+        partials = [partial for partial in partials if partial]
+        if not partials:
+            return "Unable to summarize data at this time."
+
+        partials = reduce_until_fits(
+            partials, self.combine_summaries, self.context_tokens, self.chunk_tokens,
+            self.max_workers, self.max_depth
+        )
+        response = self.send_prompt_to_llama(self.build_report_prompt("\n\n".join(partials)), route='summarize_data')
+        return response or "Unable to summarize data at this time."
+
+    def summarize_chunk(self, agent_type, chunk):
+        """
+        Map step: condenses one chunk of an agent's output.
+        """
+        prompt = (
+            f"Summarize the following excerpt from the {agent_type} analysis of a startup. Keep every concrete fact, figure, regulation, risk and recommendation, and drop repetition. Respond in Markdown.\n\n{chunk}"
+        )
+        response = self.send_prompt_to_llama(prompt, route='summarize_chunk')
+        if not response:
+            self.logger.warning(f"Dropping an unsummarized {agent_type} chunk from the report input.")
+            return None
+        return f"### {agent_type}\n{response}"
+
+    def combine_summaries(self, summaries):
+        """
+        Reduce step: merges several partial summaries into one.
+        """
+        joined = "\n\n".join(summaries)
+        prompt = (
+            f"Merge the following partial summaries of a startup analysis into one concise summary. Keep the section headings, every concrete fact and figure, and remove duplicates. Respond in Markdown.\n\n{joined}"
+        )
+        return self.send_prompt_to_llama(prompt, route='reduce_summaries')
+
     def format_report_with_llama(self, summary):
         """
         Optionally formats the summary into a final report using Llama via Groq.
@@ -90,7 +148,7 @@ class GeneralizedAgentHelper:
             prompt = (
                 f"Format the following summary into a polished Markdown report:\n\n {summary}\n\n Ensure that the report has a clear structure, with appropriate headings, subheadings, and formatting."
             )
-            response = self.send_prompt_to_llama(prompt, max_tokens=500)
+            response = self.send_prompt_to_llama(prompt, route='format_report')
             if response:
                 return response
             else:
@@ -3,6 +3,8 @@
 import yaml
 import logging
 from .legal_agent_helper import LegalAgentHelper
+from ..results import LegalAnalysis
+from ..rendering import render_markdown
 
 
 class LegalAgent:
@@ -15,7 +17,10 @@ class LegalAgent:
         llama_api_key = config['agents']['legal_agent']['llama_api_key']
 
         # Initialize helper functions
-        self.helper = LegalAgentHelper(llama_api_key_env_var='LEGAL_AGENT_API_KEY')
+        self.helper = LegalAgentHelper(llama_api_key_env_var='LEGAL_AGENT_API_KEY', llm_config=config.get('llm'))
+
+        # Ask for independent sections in one request when enabled
+        self.fused_sections = (config.get('llm') or {}).get('fused_sections', False)
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -32,54 +37,37 @@ class LegalAgent:
             industry = input_data.get('industry', 'General')
             business_model = input_data.get('business_model', 'Standard')  # e.g., Subscription, Freemium
 
+            # Fetch independent sections in one round trip when fused mode is enabled
+            fused = self.helper.fetch_sections_fused(industry, business_model) if self.fused_sections else {}
+
             # Fetch regulations
-            regulations = self.helper.fetch_regulations(industry)
+            regulations = fused.get('regulations') or self.helper.fetch_regulations(industry)
 
             # Generate compliance checklist
             compliance_checklist = self.helper.generate_compliance_checklist(regulations)
 
             # Assess legal risks
-            legal_risks = self.helper.assess_legal_risks(business_model)
+            legal_risks = fused.get('legal_risks') or self.helper.assess_legal_risks(business_model)
 
             # Compile the analysis
-            analysis = {
-                "regulations": regulations,
-                "compliance_checklist": compliance_checklist,
-                "legal_risks": legal_risks
-            }
-
-            # Format the analysis into a readable string
-            formatted_analysis = self.format_analysis(analysis)
+            analysis = LegalAnalysis(
+                regulations=regulations,
+                compliance_checklist=compliance_checklist,
+                legal_risks=legal_risks
+            )
 
             self.logger.info("Legal analysis completed successfully.")
-            return formatted_analysis
+            return analysis
         except Exception as e:
             self.logger.error(f"Error during legal analysis: {e}")
             return "An error occurred during legal analysis."
 
     def format_analysis(self, analysis):
         """
-        Formats the analysis dictionary into a readable string.
+        Formats the analysis result into a readable Markdown string.
         """
         try:
-            formatted = "**Regulations:**\n"
-            formatted += f"\n{analysis['regulations']}\n"
-            # formatted += f"Data Protection Laws: {analysis['regulations'].get('data_protection_laws', 'N/A')}\n"
-            # formatted += f"Licensing Requirements: {analysis['regulations'].get('licensing_requirements', 'N/A')}\n"
-            # formatted += f"Compliance Standards: {analysis['regulations'].get('compliance_standards', 'N/A')}\n"
-            # formatted += f"Other Regulations: {', '.join(analysis['regulations'].get('other_regulations', []))}\n"
-
-            formatted += "\n**Compliance Checklist:**\n"
-            formatted += f"{analysis['compliance_checklist']}\n"
-            # for idx, item in enumerate(analysis['compliance_checklist'], 1):
-            #     formatted += f"{idx}. {item}\n"
-
-            formatted += "\n**Legal Risks:**\n"
-            formatted += f"{analysis['legal_risks']}\n"
-            # for idx, risk in enumerate(analysis['legal_risks'], 1):
-            #     formatted += f"{idx}. {risk}\n"
-
-            return formatted
+            return render_markdown(analysis)
         except Exception as e:
             self.logger.error(f"Error formatting analysis: {e}")
             return "Unable to format legal analysis at this time."
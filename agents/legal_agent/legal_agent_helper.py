@@ -4,10 +4,13 @@ import logging
 import json
 import os
 from groq import Groq  # Assuming Groq library provides a client named GroqClient
+from llm.router import LlamaRouter
+from llm.fused import request_fused_sections
 
 
 class LegalAgentHelper:
-    def __init__(self, llama_api_key_env_var='LEGAL_AGENT_API_KEY', llama_endpoint='https://grqoclound.api/llama'):
+    def __init__(self, llama_api_key_env_var='LEGAL_AGENT_API_KEY', llama_endpoint='https://grqoclound.api/llama',
+                 llm_config=None):
         self.logger = logging.getLogger(__name__)
         self.llama_endpoint = llama_endpoint
 
@@ -16,33 +19,14 @@ class LegalAgentHelper:
             raise ValueError(f"Environment variable {llama_api_key_env_var} not set.")
 
         self.client = Groq(api_key=self.llama_api_key)
+        self.router = LlamaRouter(self.client, llm_config, agent='Legal')
 
-    def send_prompt_to_llama(self, prompt, max_tokens=500, temperature=0.7):
+    def send_prompt_to_llama(self, prompt, route='default', max_tokens=None, temperature=None):
         """
-        Sends a prompt to the Llama model via GroqClient and retrieves the response.
+        Sends a prompt to the Llama model configured for the route and retrieves the response.
         """
-        try:
-            # Wrapping the prompt in a list of dictionaries as required by Groq's API
-            messages = [{"role": "user", "content": prompt}]
-            completion = self.client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                top_p=1,
-                stream=True
-            )
-
-            # Collecting the streamed response
-            response_text = ""
-            for chunk in completion:
-                response_text += chunk.choices[0].delta.content or ""
+        return self.router.send(route, prompt, max_tokens=max_tokens, temperature=temperature)
 
-            return response_text.strip()
-
-        except Exception as e:
-            self.logger.error(f"Error sending prompt to Llama via Groq: {e}")
-            return None
     def fetch_regulations(self, industry):
         """
         Fetches relevant regulations based on the startup's industry using Llama via Groq.
@@ -50,8 +34,8 @@ class LegalAgentHelper:
         prompt = (
             f"Provide a detailed overview of the regulations applicable to the {industry} industry. Include data protection laws, licensing requirements, compliance standards, and any other relevant regulations. Format the response as a JSON object with the following keys: 'data_protection_laws', 'licensing_requirements', 'compliance_standards', 'other_regulations'. Return only the json object nothing else"
         )
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='fetch_regulations')
+        return response or "Unable to fetch regulations at this time."
         # if response:
         #     try:
         #         regulations = json.loads(response)
@@ -82,7 +66,7 @@ class LegalAgentHelper:
             prompt = (
                 f"Based on the following regulations, generate a detailed compliance checklist for a startup in the industry.\n\n '{regulations_json}' \n\n Provide the checklist as a JSON array of strings. Return only the json object nothing else"
             )
-            response = self.send_prompt_to_llama(prompt)
+            response = self.send_prompt_to_llama(prompt, route='generate_compliance_checklist')
             if response:
                 try:
                     checklist = json.loads(response)
@@ -103,8 +87,8 @@ class LegalAgentHelper:
         prompt = (
             f"Assess the potential legal risks associated with the '{business_model}' business model. Consider aspects such as data privacy, intellectual property, contractual obligations, and regulatory compliance.Format the response as a JSON array of strings. Return only the json object nothing else"
         )
-        response = self.send_prompt_to_llama(prompt)
-        return response
+        response = self.send_prompt_to_llama(prompt, route='assess_legal_risks')
+        return response or "Unable to assess legal risks at this time."
         # if response:
         #     try:
         #         risks = json.loads(response)
@@ -114,3 +98,25 @@ class LegalAgentHelper:
         #         return ["Unable to assess legal risks at this time."]
         # else:
         #     return ["Unable to assess legal risks at this time."]
+
+    def fetch_sections_fused(self, industry, business_model):
+        """
+        Fetches regulations and legal risks in a single request.
+
+        Returns:
+            dict: Parsed sections keyed by 'regulations' and 'legal_risks' for every section that passed validation.
+        """
+        context = (
+            f"You are advising a startup in the {industry} industry using the '{business_model}' business model."
+        )
+        sections = {
+            "regulations": (
+                f"a JSON object describing the regulations applicable to the {industry} industry, with the keys 'data_protection_laws', 'licensing_requirements', 'compliance_standards', 'other_regulations'",
+                dict
+            ),
+            "legal_risks": (
+                f"a JSON array of strings assessing the legal risks of the '{business_model}' business model, considering data privacy, intellectual property, contractual obligations, and regulatory compliance",
+                list
+            ),
+        }
+        return request_fused_sections(self.send_prompt_to_llama, 'fused_legal', context, sections)
@@ -0,0 +1,51 @@
+# agents/rendering.py
+
+from .results import AnalysisResult
+
+
+def _render_value(value, parts, indent=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                parts.append(f"{indent}- **{key}**:\n")
+                _render_value(item, parts, indent + "  ")
+            else:
+                parts.append(f"{indent}- **{key}**: {item}\n")
+    elif isinstance(value, list):
+        for idx, item in enumerate(value, 1):
+            if isinstance(item, (dict, list)):
+                parts.append(f"{indent}{idx}.\n")
+                _render_value(item, parts, indent + "   ")
+            else:
+                parts.append(f"{indent}{idx}. {item}\n")
+    elif value is None:
+        parts.append(f"{indent}N/A\n")
+    else:
+        parts.append(f"{indent}{value}\n")
+
+
+def render_markdown(result):
+    """
+    Renders an analysis result (or plain text) as Markdown.
+    """
+    if not isinstance(result, AnalysisResult):
+        return result if isinstance(result, str) else str(result)
+
+    parts = []
+    for heading, value in result.sections():
+        if parts:
+            parts.append("\n")
+        parts.append(f"**{heading}:**\n")
+        _render_value(value, parts)
+    return "".join(parts)
+
+
+def render_sections(outputs, headings=None):
+    """
+    Renders several agents' outputs into one Markdown document, one ``##`` heading per agent.
+    """
+    parts = []
+    for agent_type, output in outputs.items():
+        heading = (headings or {}).get(agent_type, agent_type)
+        parts.append(f"## {heading}\n\n{render_markdown(output)}\n")
+    return "\n".join(parts)
@@ -0,0 +1,104 @@
+# agents/results.py
+
+import json
+
+
+def parse_section(response):
+    """
+    Parses an LLM section response into JSON data when possible, otherwise keeps the text.
+
+    Tolerates Markdown code fences around the JSON the prompts ask for.
+    """
+    if not isinstance(response, str):
+        return response
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+    if text[:1] in ("{", "["):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    return response
+
+
+class AnalysisResult:
+    """
+    Base class for an agent's analysis.
+
+    Subclasses list their sections in ``SECTIONS`` as ``(attribute, heading)``
+    pairs. Each section holds parsed JSON data (dict/list) or plain text.
+    The wire form is a compact JSON-ready dict: ``{"k": KIND, "v": [section values]}``.
+    """
+    __slots__ = ()
+    KIND = None
+    SECTIONS = ()
+
+    def __init__(self, *values, **sections):
+        names = [name for name, _ in self.SECTIONS]
+        provided = dict(zip(names, values))
+        provided.update(sections)
+        for name in names:
+            setattr(self, name, parse_section(provided.get(name)))
+
+    def sections(self):
+        """
+        Yields ``(heading, value)`` for each section in display order.
+        """
+        for name, heading in self.SECTIONS:
+            yield heading, getattr(self, name)
+
+    def to_wire(self):
+        return {"k": self.KIND, "v": [getattr(self, name) for name, _ in self.SECTIONS]}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_wire() == other.to_wire()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self.SECTIONS)
+        return f"{type(self).__name__}({fields})"
+
+
+class LegalAnalysis(AnalysisResult):
+    __slots__ = ("regulations", "compliance_checklist", "legal_risks")
+    KIND = "legal"
+    SECTIONS = (
+        ("regulations", "Regulations"),
+        ("compliance_checklist", "Compliance Checklist"),
+        ("legal_risks", "Legal Risks"),
+    )
+
+
+class EconomicAnalysis(AnalysisResult):
+    __slots__ = ("market_data", "financial_projections", "competitive_analysis")
+    KIND = "economics"
+    SECTIONS = (
+        ("market_data", "Market Data"),
+        ("financial_projections", "Financial Projections"),
+        ("competitive_analysis", "Competitive Analysis"),
+    )
+
+
+class BusinessStructureAnalysis(AnalysisResult):
+    __slots__ = ("proposed_business_models", "organizational_structure", "scalability_plan")
+    KIND = "business_structure"
+    SECTIONS = (
+        ("proposed_business_models", "Proposed Business Models"),
+        ("organizational_structure", "Organizational Structure"),
+        ("scalability_plan", "Scalability Plan"),
+    )
+
+
+RESULT_TYPES = {cls.KIND: cls for cls in (LegalAnalysis, EconomicAnalysis, BusinessStructureAnalysis)}
+
+
+def from_wire(data):
+    """
+    Rebuilds a result from its wire form. Anything else (plain text, legacy dicts) is returned unchanged.
+    """
+    if isinstance(data, dict) and data.get("k") in RESULT_TYPES and isinstance(data.get("v"), list):
+        return RESULT_TYPES[data["k"]](*data["v"])
+    return data
@@ -1,12 +1,16 @@
 # app.py
 
 import streamlit as st
-import json
 import os
+import json
+import time
 from dotenv import load_dotenv
 from langchain.llms import OpenAI  # Replace with Groq if using it
 from langchain.chains import ConversationChain
 from langchain.memory import ConversationBufferMemory
+from storage.storage import Storage, PENDING, READY, FAILED, DEGRADED, REPORT_AGENT
+from agents.results import from_wire
+from agents.rendering import render_markdown
 
 # Load environment variables
 # Load environment variables
@@ -28,21 +32,128 @@ memory = ConversationBufferMemory(memory_key="history", return_messages=True)
 conversation = ConversationChain(llm=llm, memory=memory, verbose=False)
 
 
-# Function to load the comprehensive report
+# Seconds between cheap change-version checks while sections are still pending
+POLL_INTERVAL_SECONDS = 2
+# Sections still pending this long after their run started belong to a run that died
+RUN_TIMEOUT_SECONDS = 30 * 60
+SEARCH_RESULT_LIMIT = 20
+
+SECTION_TITLES = {
+    "Legal": "Legal Analysis",
+    "Economics": "Economic Analysis",
+    "BusinessStructure": "Business Structure Analysis",
+}
+
+
+@st.cache_resource
+def get_storage() -> Storage:
+    return Storage()
+
+
+# Sections are only reloaded when the idea's change version moves; the report itself is served from its artifacts
 @st.cache_data(show_spinner=False)
-def load_report(idea_id: str) -> str:
+def load_sections(idea_id: str, version: int):
     try:
-        with open("storage/data.json", "r") as f:
-            storage_data = json.load(f)
-        report = storage_data.get(idea_id, {}).get("ComprehensiveReport", None)
-        if report:
-            return report
-        else:
-            st.error(f"No report found for idea_id: {idea_id}")
-            return None
+        statuses, outputs, artifact_version, run_started_at = get_storage().retrieve_idea(
+            idea_id, exclude=(REPORT_AGENT,)
+        )
+        sections = {agent_type: render_markdown(from_wire(output)) for agent_type, output in outputs.items()}
+        return statuses, sections, artifact_version, run_started_at
     except Exception as e:
         st.error(f"Error loading report: {e}")
+        return {}, {}, None, None
+
+
+# Only used for reports stored before artifacts existed, until they are backfilled
+@st.cache_data(show_spinner=False)
+def load_report_markdown(idea_id: str, version: int):
+    return get_storage().retrieve_section(idea_id, REPORT_AGENT, "No report available.")
+
+
+# Pre-rendered report artifacts are immutable per version, so they are read from disk once
+@st.cache_data(show_spinner=False)
+def load_artifacts(idea_id: str, artifact_version: str):
+    storage = get_storage()
+    html = storage.retrieve_artifact(idea_id, "html", artifact_version)
+    toc = storage.retrieve_artifact(idea_id, "toc", artifact_version)
+    text = storage.retrieve_artifact(idea_id, "text", artifact_version)
+    if html is None or toc is None or text is None:
         return None
+    return html.decode("utf-8"), json.loads(toc), text
+
+
+def show_artifacts(idea_id: str, artifacts):
+    html, toc, text = artifacts
+    if toc:
+        with st.expander("Contents"):
+            st.markdown("\n".join(
+                f"{'  ' * (entry['level'] - 1)}- [{entry['title']}](#{entry['anchor']})" for entry in toc
+            ))
+    download_html, download_text = st.columns(2)
+    download_html.download_button("Download HTML", html, file_name=f"{idea_id}.html", mime="text/html")
+    download_text.download_button("Download text", text, file_name=f"{idea_id}.txt", mime="text/plain")
+    # The HTML is sanitized when the report is stored; it is served as-is
+    st.html(html)
+
+
+def render_report(idea_id: str):
+    version = get_storage().get_version(idea_id)
+    statuses, sections, artifact_version, run_started_at = load_sections(idea_id, version)
+    run_timed_out = bool(run_started_at) and time.time() - run_started_at > RUN_TIMEOUT_SECONDS
+    if run_timed_out:
+        # Nothing will publish these sections any more; stop polling and show them as failed
+        statuses = {agent_type: FAILED if status == PENDING else status for agent_type, status in statuses.items()}
+    report_ready = statuses.get(REPORT_AGENT) in (READY, DEGRADED)
+    polling = any(status == PENDING for status in statuses.values())
+    if (report_ready, polling) != (st.session_state.get("report_ready", False), st.session_state.get("polling", False)):
+        # Let the rest of the page (the chat) catch up with the report, and switch polling on or off
+        st.session_state["report_ready"] = report_ready
+        st.session_state["polling"] = polling
+        st.rerun()
+
+    if not statuses:
+        st.error(f"No report found for idea_id: {idea_id}")
+        return
+
+    st.header("Comprehensive StartupGPT Report")
+    degraded = [
+        SECTION_TITLES.get(agent_type, "Report overview" if agent_type == REPORT_AGENT else agent_type)
+        for agent_type, status in statuses.items() if status == DEGRADED
+    ]
+    if degraded:
+        st.warning(f"The LLM was unavailable while generating: {', '.join(degraded)}. "
+                   f"These parts contain cached or placeholder text.")
+    if report_ready:
+        # Format and display the report as Markdown text
+        st.markdown("### Report Overview\n")
+        artifacts = load_artifacts(idea_id, artifact_version) if artifact_version else None
+        if artifacts:
+            show_artifacts(idea_id, artifacts)
+        else:
+            # Reports stored before artifacts existed are rendered from Markdown until backfilled
+            st.markdown(load_report_markdown(idea_id, version), unsafe_allow_html=True)
+        return
+
+    # Show each agent's section as soon as it is published, with placeholders for the rest
+    if run_timed_out:
+        st.error("The run for this idea stopped before finishing. Run the analysis again to complete the report.")
+    else:
+        st.info("The comprehensive report is still being generated. Sections appear as each agent finishes.")
+    for agent_type, status in statuses.items():
+        if agent_type == REPORT_AGENT:
+            continue
+        st.subheader(SECTION_TITLES.get(agent_type, agent_type))
+        if status == PENDING:
+            st.caption("⏳ Pending...")
+        elif status == FAILED:
+            st.warning(sections.get(agent_type) or "This section could not be generated.")
+        else:
+            st.markdown(sections.get(agent_type, ""), unsafe_allow_html=True)
+
+
+# Checks for new sections only while some are pending; a finished report is rendered once
+poll_report = st.fragment(run_every=POLL_INTERVAL_SECONDS)(render_report)
+show_report = st.fragment(render_report)
 
 
 # Initialize Streamlit app
@@ -53,16 +164,35 @@ st.title("📊 Comprehensive StartupGPT Report & Chatbot")
 st.sidebar.header("Report Selection")
 idea_id = st.sidebar.text_input("Enter Idea ID", value="idea_007")
 
-# Load and display the report
-report = load_report(idea_id)
-
-if report:
-    st.header("Comprehensive StartupGPT Report")
-
-    # Format and display the report as Markdown text
-    st.markdown("### Report Overview\n")
-    st.markdown(report, unsafe_allow_html=True)
-
+# Search stored reports by text and facets; picking a result overrides the Idea ID above
+st.sidebar.header("Search Reports")
+search_query = st.sidebar.text_input("Search text")
+facet_filters = {}
+for facet, label in (("industry", "Industry"), ("business_model", "Business model"), ("company_size", "Company size")):
+    options = ["Any"] + [value for value, _ in get_storage().search_index.facet_values(facet)]
+    choice = st.sidebar.selectbox(label, options)
+    if choice != "Any":
+        facet_filters[facet] = choice
+
+if search_query.strip() or facet_filters:
+    results = get_storage().search(search_query, limit=SEARCH_RESULT_LIMIT, **facet_filters)
+    if results:
+        labels = {
+            result["idea_id"]: f"{result['idea_id']} ({', '.join(result['sections'])})" if result["sections"]
+            else result["idea_id"]
+            for result in results
+        }
+        idea_id = st.sidebar.radio("Results", list(labels), format_func=labels.get)
+    else:
+        st.sidebar.caption("No matching reports.")
+
+# Load and display the report (and any sections that are already available)
+if st.session_state.get("polling", False):
+    poll_report(idea_id)
+else:
+    show_report(idea_id)
+
+if st.session_state.get("report_ready"):
     # Chat interface
     st.header("💬 Ask Questions About the Report")
     user_question = st.text_input("Enter your question here:")
@@ -77,4 +207,4 @@ if report:
 
                 # Display the answer
                 st.success("**Answer:**")
-                st.write(answer)
\ No newline at end of file
+                st.write(answer)
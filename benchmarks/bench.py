@@ -0,0 +1,228 @@
+# benchmarks/bench.py
+"""
+Micro-benchmarks for the local (non-LLM) costs of StartupGPT as the number of stored ideas grows.
+
+Results depend on the machine; re-save the baseline when benchmarking on different hardware.
+
+Usage:
+    python -m benchmarks.bench                       # run and compare with benchmarks/baseline.json
+    python -m benchmarks.bench --sizes 1000 10000    # pick dataset sizes
+    python -m benchmarks.bench --save-baseline       # record the current results as the baseline
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.storage import Storage  # noqa: E402
+from agents.results import LegalAnalysis, BusinessStructureAnalysis, from_wire  # noqa: E402
+from agents.rendering import render_markdown, render_sections  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [1000, 10000, 100000]
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Education", "Energy"]
+
+# The fallbacks written for every idea when the LLM is unreachable
+FALLBACK_SECTIONS = {
+    "Legal": "**Regulations:**\nUnable to fetch regulations at this time.\n\n**Compliance Checklist:**\n"
+             "Unable to generate compliance checklist at this time.\n\n**Legal Risks:**\n"
+             "Unable to assess legal risks at this time.\n",
+    "Economics": "**Market Data:**\nUnable to fetch market data at this time.\n",
+    "BusinessStructure": "**Proposed Business Models:**\nUnable to propose business models at this time.\n",
+    "ComprehensiveReport": "An error occurred during report generation.",
+}
+
+
+def synthetic_section(rng, agent_type, idea_number):
+    """
+    Returns a section body: shared per industry, a fallback, or unique to the idea.
+    """
+    roll = rng.random()
+    if roll < 0.3:
+        return FALLBACK_SECTIONS[agent_type]
+    if roll < 0.6:
+        industry = INDUSTRIES[idea_number % len(INDUSTRIES)]
+        return f"**{agent_type} for {industry}:**\n" + f"- Shared {industry} finding.\n" * 40
+    words = " ".join(f"w{rng.randrange(50000)}" for _ in range(300))
+    return f"# {agent_type} report for idea {idea_number}\n\n{words}\n"
+
+
+def build_storage(directory, size, seed=0):
+    """
+    Writes a legacy-format data file with ``size`` ideas and lets Storage migrate it.
+    """
+    rng = random.Random(seed)
+    legacy = {
+        f"idea_{number:06d}": {
+            agent_type: synthetic_section(rng, agent_type, number) for agent_type in FALLBACK_SECTIONS
+        }
+        for number in range(size)
+    }
+    storage_file = os.path.join(directory, "data.json")
+    with open(storage_file, "w") as f:
+        json.dump(legacy, f)
+    storage = Storage(storage_file=storage_file)
+    storage.compact()
+    return storage
+
+
+def timed(operation, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_storage(size, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        storage = build_storage(directory, size)
+        results["build_s"] = time.perf_counter() - start
+
+        idea_ids = [f"idea_{number:06d}" for number in random.Random(1).sample(range(size), repeat)]
+        results["store_output_s"] = timed(
+            lambda i: storage.store_output("Legal", f"Updated legal section {i}", idea_ids[i]), repeat
+        )
+        results["retrieve_outputs_s"] = timed(lambda i: storage.retrieve_outputs(idea_ids[i]), repeat)
+        results["load_report_s"] = timed(lambda i: load_report(storage, idea_ids[i]), repeat)
+        results["report_input_s"] = timed(lambda i: build_report_input(storage, idea_ids[i]), repeat)
+        # What loading one idea reads besides its blobs
+        results["manifest_bytes"] = statistics.median(
+            os.path.getsize(storage._manifest_path(idea_id)) for idea_id in idea_ids
+        )
+        results["blob_bytes"] = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(storage.blob_dir) for name in names
+        )
+    return results
+
+
+def load_report(storage, idea_id):
+    """
+    Loads an idea the way app.py does: one manifest read without the report body, then its pre-rendered artifacts.
+    """
+    _, _, artifact_version, _ = storage.retrieve_idea(idea_id, exclude=("ComprehensiveReport",))
+    return [storage.retrieve_artifact(idea_id, kind, artifact_version) for kind in ("html", "toc", "text")]
+
+
+def build_report_input(storage, idea_id):
+    """
+    Loads an idea's agent sections and renders them into the Markdown GeneralizedAgent puts in its report prompt.
+    """
+    sections = {
+        agent_type: from_wire(output) for agent_type, output in storage.retrieve_outputs(idea_id).items()
+        if agent_type != "ComprehensiveReport"
+    }
+    return render_sections(sections)
+
+
+def bench_formatting(repeat, iterations=1000):
+    """
+    Times rendering analysis results to Markdown, as the agents and report synthesis do.
+    """
+    text_items = [f"Item {number} with some descriptive text" for number in range(50)]
+    structure = {f"Role {number}": "Owns a slice of the roadmap and its delivery" for number in range(20)}
+    cases = {
+        "render_legal_per_s": LegalAnalysis(
+            regulations={"data_protection_laws": text_items[:5], "licensing_requirements": "Varies by state"},
+            compliance_checklist=text_items,
+            legal_risks=text_items[:10]
+        ),
+        "render_business_structure_per_s": BusinessStructureAnalysis(
+            proposed_business_models=text_items[:10],
+            organizational_structure=structure,
+            scalability_plan=" ".join(text_items)
+        ),
+    }
+    results = {}
+    for name, analysis in cases.items():
+        seconds = timed(lambda i: [render_markdown(analysis) for _ in range(iterations)], repeat)
+        results[name] = iterations / seconds
+
+    outputs = dict(zip(("Legal", "BusinessStructure"), cases.values()))
+    seconds = timed(lambda i: [render_sections(outputs) for _ in range(iterations)], repeat)
+    results["render_report_input_per_s"] = iterations / seconds
+
+    # The compliance checklist and scalability prompts still embed their inputs as JSON and parse JSON replies
+    regulations = cases["render_legal_per_s"].regulations
+    checklist_reply = json.dumps(text_items)
+
+    def json_round_trip():
+        json.dumps(regulations, indent=4)
+        json.loads(checklist_reply)
+        json.dumps(structure, indent=4)
+
+    seconds = timed(lambda i: [json_round_trip() for _ in range(iterations)], repeat)
+    results["json_prompt_per_s"] = iterations / seconds
+    return results
+
+
+def run(sizes, repeat):
+    results = {"formatting": bench_formatting(repeat)}
+    for size in sizes:
+        print(f"Benchmarking {size} ideas...", file=sys.stderr)
+        results[str(size)] = bench_storage(size, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints each metric next to its baseline and returns the metrics that regressed past ``threshold``.
+    """
+    regressions = []
+    for group, metrics in results.items():
+        for name, value in metrics.items():
+            previous = baseline.get(group, {}).get(name)
+            if not previous:
+                print(f"{group:>10} {name:<32} {value:14.6f}")
+                continue
+            # Throughput metrics regress when they drop, everything else when it grows
+            ratio = previous / value if name.endswith("_per_s") else value / previous
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{group:>10} {name:<32} {value:14.6f}  baseline {previous:14.6f}  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append(f"{group}.{name}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StartupGPT storage/formatting micro-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio against the baseline that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# llm/budget.py
+
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+
+OK = "ok"
+SHRINK = "shrink"
+DOWNGRADE = "downgrade"
+SKIP = "skip"
+
+HIGH = "high"
+LOW = "low"
+
+# The idea whose prompts are currently being sent; set by the pipeline around each agent run.
+# A tuple of ideas means the response is shared by all of them.
+current_idea = contextvars.ContextVar("current_idea", default=None)
+
+# When set to a list, every call charged in this context is also appended to it, so it can be reassigned later
+current_charges = contextvars.ContextVar("current_charges", default=None)
+
+
+@contextmanager
+def idea_scope(idea_id):
+    """
+    Attributes every LLM call made inside the block (in this thread) to ``idea_id``.
+
+    Pass a tuple of idea IDs for calls whose response several ideas share; their
+    tokens and cost are then split evenly across those ideas.
+    """
+    token = current_idea.set(idea_id)
+    try:
+        yield
+    finally:
+        current_idea.reset(token)
+
+
+class Usage:
+    """
+    Token and cost totals for one idea, agent, API key or the whole batch.
+    """
+    __slots__ = ("calls", "skipped", "prompt_tokens", "completion_tokens", "cost")
+
+    def __init__(self):
+        self.calls = 0
+        self.skipped = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+    @property
+    def tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens, completion_tokens, cost, calls=1):
+        self.calls += calls
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost += cost
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "skipped": self.skipped,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": round(self.cost, 6),
+        }
+
+
+class BudgetLedger:
+    """
+    Accounts tokens and cost per idea, per agent and per API key, and enforces budgets.
+
+    Limits left unset (or 0) are not enforced. As an idea or the batch approaches
+    its limit, low-priority routes first get a smaller ``max_tokens``
+    (``shrink_at``), then move to the cheap tier (``downgrade_at``), then are
+    skipped (``skip_at``). Once a limit is reached every route is skipped.
+    """
+
+    def __init__(self, budget_config=None):
+        self.logger = logging.getLogger(__name__)
+        budget_config = budget_config or {}
+        self.idea_tokens = budget_config.get('idea_tokens')
+        self.idea_cost = budget_config.get('idea_cost')
+        self.batch_tokens = budget_config.get('batch_tokens')
+        self.batch_cost = budget_config.get('batch_cost')
+        self.shrink_at = budget_config.get('shrink_at', 0.7)
+        self.downgrade_at = budget_config.get('downgrade_at', 0.85)
+        self.skip_at = budget_config.get('skip_at', 0.95)
+        self.shrink_factor = budget_config.get('shrink_factor', 0.5)
+        self.cheap_tier = budget_config.get('cheap_tier', 'fast')
+
+        self.batch = Usage()
+        self.ideas = {}
+        self.agents = {}
+        self.keys = {}
+        self.idea_keys = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _utilization(used, limit):
+        return used / limit if limit else 0.0
+
+    @staticmethod
+    def _shares(idea_id, amount):
+        """
+        Splits an integer amount evenly across the idea(s), as ``[(idea_id, share), ...]``.
+        """
+        ideas = idea_id if isinstance(idea_id, tuple) else (idea_id,)
+        base, remainder = divmod(amount, len(ideas))
+        return [(idea, base + (1 if i < remainder else 0)) for i, idea in enumerate(ideas)]
+
+    def utilization(self, idea_id, projected_tokens=0):
+        """
+        Returns the highest fraction of any budget that would be used after a call of ``projected_tokens``.
+
+        A shared call counts against each of its ideas with that idea's share of the tokens.
+        """
+        with self._lock:
+            utilizations = [
+                self._utilization(self.batch.tokens + projected_tokens, self.batch_tokens),
+                self._utilization(self.batch.cost, self.batch_cost),
+            ]
+            for idea_id, share in self._shares(idea_id, projected_tokens):
+                idea = self.ideas.get(idea_id) or Usage()
+                utilizations.append(self._utilization(idea.tokens + share, self.idea_tokens))
+                utilizations.append(self._utilization(idea.cost, self.idea_cost))
+            return max(utilizations)
+
+    def plan(self, idea_id, priority, projected_tokens, max_tokens, tier):
+        """
+        Decides how a call should run under the current budgets.
+
+        Returns:
+            tuple: ``(action, max_tokens, tier)`` where action is one of OK, SHRINK, DOWNGRADE or SKIP.
+        """
+        used = self.utilization(idea_id, projected_tokens)
+        if used >= 1.0:
+            return SKIP, max_tokens, tier
+        if priority != LOW:
+            return OK, max_tokens, tier
+        if used >= self.skip_at:
+            return SKIP, max_tokens, tier
+        if used >= self.downgrade_at:
+            return DOWNGRADE, max(1, int(max_tokens * self.shrink_factor)), self.cheap_tier
+        if used >= self.shrink_at:
+            return SHRINK, max(1, int(max_tokens * self.shrink_factor)), tier
+        return OK, max_tokens, tier
+
+    def record(self, idea_id, agent, api_key, prompt_tokens, completion_tokens, cost):
+        """
+        Charges a call to the batch, the API key and its idea(s); a shared call is split evenly.
+        """
+        with self._lock:
+            self.batch.add(prompt_tokens, completion_tokens, cost)
+            self.keys.setdefault(api_key, Usage()).add(prompt_tokens, completion_tokens, cost)
+            self._charge(idea_id, agent, api_key, prompt_tokens, completion_tokens, cost)
+        charges = current_charges.get()
+        if charges is not None:
+            charges.append((agent, api_key, prompt_tokens, completion_tokens, cost))
+
+    def reassign(self, from_idea, to_idea, agent, api_key, prompt_tokens, completion_tokens, cost):
+        """
+        Moves a recorded call from the idea(s) it was charged to onto other idea(s); batch and key totals are unchanged.
+        """
+        with self._lock:
+            self._charge(from_idea, agent, api_key, prompt_tokens, completion_tokens, cost, sign=-1)
+            self._charge(to_idea, agent, api_key, prompt_tokens, completion_tokens, cost)
+
+    def _charge(self, idea_id, agent, api_key, prompt_tokens, completion_tokens, cost, sign=1):
+        shares = zip(self._shares(idea_id, prompt_tokens), self._shares(idea_id, completion_tokens))
+        # Each sharing idea counts the call once and pays its share of the tokens and cost
+        for (idea, prompt_share), (_, completion_share) in shares:
+            cost_share = cost / len(idea_id) if isinstance(idea_id, tuple) else cost
+            for usage in (self.ideas.setdefault(idea, Usage()),
+                          self.agents.setdefault((idea, agent), Usage()),
+                          self.idea_keys.setdefault((idea, api_key), Usage())):
+                usage.add(sign * prompt_share, sign * completion_share, sign * cost_share, calls=sign)
+
+    def record_skip(self, idea_id, agent):
+        with self._lock:
+            self.batch.skipped += 1
+            for idea, _ in self._shares(idea_id, 0):
+                self.ideas.setdefault(idea, Usage()).skipped += 1
+                self.agents.setdefault((idea, agent), Usage()).skipped += 1
+
+    def usage_for(self, idea_id):
+        """
+        Returns the idea's totals with per-agent and per-API-key breakdowns, ready to be stored with its outputs.
+        """
+        with self._lock:
+            return {
+                "total": (self.ideas.get(idea_id) or Usage()).as_dict(),
+                "agents": {
+                    agent: usage.as_dict()
+                    for (idea, agent), usage in self.agents.items() if idea == idea_id
+                },
+                "keys": {
+                    api_key: usage.as_dict()
+                    for (idea, api_key), usage in self.idea_keys.items() if idea == idea_id
+                },
+            }
+
+    def summary(self):
+        with self._lock:
+            return {
+                "batch": self.batch.as_dict(),
+                "keys": {key: usage.as_dict() for key, usage in self.keys.items()},
+            }
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger(budget_config=None):
+    """
+    Returns the process-wide ledger, so batch budgets span every idea in the run.
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = BudgetLedger(budget_config)
+        return _ledger
@@ -0,0 +1,141 @@
+# llm/cassette.py
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(Exception):
+    """
+    Raised in replay mode when no recording exists for a request.
+    """
+
+
+def request_key(model, messages, temperature, max_tokens):
+    """
+    Identifies a request by everything that affects its response.
+    """
+    request = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True
+    )
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """
+    Records LLM requests with their streamed chunk timings and replays them deterministically.
+
+    Each request is stored as ``<path>/<request key>.jsonl`` with one line per
+    recorded interaction, so recording only ever appends. Replays cycle through a
+    request's interactions in the order they were recorded, sleeping between
+    chunks for the recorded gap divided by ``speed`` (``speed: 0`` replays
+    without any delay). Recordings in the older ``<request key>.json`` format
+    are still replayed.
+    """
+
+    def __init__(self, mode=OFF, path="cassettes", speed=1.0):
+        self.logger = logging.getLogger(__name__)
+        self.mode = mode
+        self.path = path
+        self.speed = speed
+        self._replay_counts = {}
+        self._interactions = {}
+        self._lock = threading.Lock()
+        if self.mode == RECORD:
+            os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.jsonl")
+
+    def _load(self, key):
+        """
+        Returns the recorded interactions for a request, oldest first.
+        """
+        try:
+            with open(self._file(key), 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            pass
+        try:
+            with open(os.path.join(self.path, f"{key}.json"), 'r') as f:
+                return json.load(f).get("interactions", [])
+        except FileNotFoundError:
+            return []
+
+    def record(self, key, model, messages, chunks, max_tokens=None):
+        """
+        Passes ``(content, usage)`` chunks through while capturing their timing, then saves the interaction.
+        """
+        start = time.perf_counter()
+        captured = []
+        usage = {}
+        for content, chunk_usage in chunks:
+            captured.append([round(time.perf_counter() - start, 4), content])
+            if chunk_usage:
+                usage = chunk_usage
+            yield content, chunk_usage
+
+        interaction = {
+            "recorded_at": time.time(), "model": model, "max_tokens": max_tokens, "messages": messages,
+            "chunks": captured, "usage": usage,
+        }
+        line = json.dumps(interaction) + "\n"
+        with self._lock:
+            with open(self._file(key), 'a') as f:
+                f.write(line)
+        self.logger.debug(f"Recorded interaction for request {key[:12]}")
+
+    def replay(self, key):
+        """
+        Yields the recorded ``(content, usage)`` chunks for a request at the configured speed.
+        """
+        with self._lock:
+            if key not in self._interactions:
+                # Recordings do not change during a replay, so each request's file is read once
+                self._interactions[key] = self._load(key)
+            interactions = self._interactions[key]
+            if not interactions:
+                raise CassetteMissError(f"No recording for request {key[:12]} in {self.path}")
+            count = self._replay_counts.get(key, 0)
+            self._replay_counts[key] = count + 1
+        interaction = interactions[count % len(interactions)]
+        return self._play(interaction)
+
+    def _play(self, interaction):
+        start = time.perf_counter()
+        chunks = interaction["chunks"]
+        for index, (offset, content) in enumerate(chunks):
+            if self.speed:
+                delay = offset / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            usage = interaction.get("usage") if index == len(chunks) - 1 else None
+            yield content, usage
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(cassette_config=None):
+    """
+    Returns the process-wide cassette for a configuration so replay order is shared by all routers.
+    """
+    cassette_config = cassette_config or {}
+    # YAML reads an unquoted off as False
+    mode = cassette_config.get('mode') or OFF
+    path = cassette_config.get('path', 'cassettes')
+    speed = cassette_config.get('speed', 1.0)
+    with _cassettes_lock:
+        key = (mode, path, speed)
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(mode, path, speed)
+        return _cassettes[key]
@@ -0,0 +1,140 @@
+# llm/circuit_breaker.py
+
+import time
+import hashlib
+import logging
+import threading
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Exceptions that point at the endpoint itself (DNS, refused connections, timeouts)
+# rather than at the API key used for the request
+CONNECTION_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout"}
+
+# Who a failed call counts against
+ENDPOINT = "endpoint"
+KEY = "key"
+REQUEST = "request"
+
+# Authentication, permission and rate-limit responses are about the API key
+KEY_STATUS_CODES = {401, 403, 429}
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures for one endpoint or API key.
+
+    After ``failure_threshold`` failures the circuit opens and calls are rejected
+    immediately. Once ``reset_timeout`` seconds have passed a single trial call is
+    let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._state = CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def cancel_trial(self):
+        """
+        Releases a half-open trial slot that was granted but never used.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                self.logger.info(f"Circuit {self.name} closed.")
+            self._state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.logger.warning(f"Circuit {self.name} opened after {self.failures} failures.")
+                self._state = OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def key_fingerprint(api_key):
+    # Never keep raw API keys in breaker names or logs
+    return hashlib.sha256(str(api_key).encode('utf-8')).hexdigest()[:8]
+
+
+def get_breaker(name, failure_threshold=3, reset_timeout=30.0):
+    """
+    Returns the process-wide breaker for ``name``, creating it on first use.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return _breakers[name]
+
+
+def is_connection_error(error):
+    return isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in CONNECTION_ERROR_NAMES
+
+
+def classify_error(error):
+    """
+    Returns ENDPOINT, KEY or REQUEST for a failed call.
+
+    Connection errors and 5xx responses count against the endpoint, auth and
+    rate-limit responses against the key. Everything else (bad requests,
+    context-length errors, local errors) is about the request itself and
+    counts against neither.
+    """
+    if is_connection_error(error):
+        return ENDPOINT
+    status_code = getattr(error, 'status_code', None)
+    if status_code in KEY_STATUS_CODES:
+        return KEY
+    if isinstance(status_code, int) and status_code >= 500:
+        return ENDPOINT
+    return REQUEST
+
+
+def open_circuits():
+    """
+    Returns the names of every circuit that is currently not closed.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.name for breaker in breakers if breaker.state != CLOSED]
@@ -0,0 +1,56 @@
+# llm/fused.py
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def extract_json_object(text):
+    """
+    Parses the outermost JSON object in a response, tolerating Markdown fences or chatter around it.
+    """
+    if not text:
+        return None
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def request_fused_sections(send_prompt, route, context, sections):
+    """
+    Asks for several independent sections in one structured response.
+
+    Args:
+        send_prompt (callable): The helper's ``send_prompt_to_llama``.
+        route (str): The routing table entry used for the fused call.
+        context (str): Shared instructions describing the startup.
+        sections (dict): Maps each section key to ``(instruction, expected_type)``.
+
+    Returns:
+        dict: Section key to parsed JSON data for every section that passed validation.
+            Missing keys should be fetched with their individual prompts.
+    """
+    keys = "\n".join(
+        f"- '{key}': {instruction}" for key, (instruction, _) in sections.items()
+    )
+    prompt = (
+        f"{context}\n\nRespond with a single JSON object containing exactly these keys:\n{keys}\n\n"
+        f"Return only the json object nothing else"
+    )
+    parsed = extract_json_object(send_prompt(prompt, route=route)) or {}
+
+    valid = {}
+    for key, (_, expected_type) in sections.items():
+        value = parsed.get(key)
+        if isinstance(value, expected_type) and value:
+            valid[key] = value
+        else:
+            logger.warning(f"Fused route {route} returned no valid '{key}', falling back to its own prompt.")
+    return valid
@@ -0,0 +1,91 @@
+# llm/map_reduce.py
+
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from llm.router import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def split_into_chunks(text, chunk_tokens):
+    """
+    Splits text into chunks of at most ``chunk_tokens`` (estimated), keeping paragraphs together where possible.
+    """
+    chunk_chars = chunk_tokens * 4
+    chunks = []
+    current = []
+    current_tokens = 0
+    for paragraph in text.split("\n\n"):
+        # Paragraphs larger than a chunk are cut at the character budget
+        pieces = [paragraph[i:i + chunk_chars] for i in range(0, len(paragraph), chunk_chars)] or [""]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > chunk_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def map_concurrently(function, items, max_workers):
+    """
+    Applies ``function`` to every item on a thread pool and returns the results in order.
+
+    Each call runs in a copy of the caller's context so per-idea budget attribution carries over.
+    """
+    if len(items) <= 1 or max_workers <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, function, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def group_to_fit(texts, chunk_tokens):
+    """
+    Packs consecutive texts into groups whose combined estimate stays within ``chunk_tokens``.
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and current_tokens + tokens > chunk_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def reduce_until_fits(summaries, combine, context_tokens, chunk_tokens, max_workers, max_depth=4):
+    """
+    Combines partial summaries level by level until they fit in ``context_tokens``.
+
+    Args:
+        summaries (list): Partial summaries from the map phase.
+        combine (callable): Summarizes a list of partial summaries into one text (or None on failure).
+
+    Returns:
+        list: Partial summaries whose joined size fits the context (or the last level reached at ``max_depth``).
+    """
+    depth = 0
+    while sum(estimate_tokens(summary) for summary in summaries) > context_tokens and len(summaries) > 1:
+        if depth >= max_depth:
+            logger.warning(f"Stopped reducing at depth {depth}; report input may exceed the model context.")
+            break
+        groups = group_to_fit(summaries, chunk_tokens)
+        if len(groups) == len(summaries):
+            # Every summary already fills a chunk on its own; pair them up so the level shrinks
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        combined = map_concurrently(combine, groups, max_workers)
+        summaries = [text or "\n\n".join(group) for text, group in zip(combined, groups)]
+        depth += 1
+        logger.info(f"Reduce level {depth}: {len(summaries)} partial summaries")
+    return summaries
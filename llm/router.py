@@ -0,0 +1,325 @@
+# llm/router.py
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from llm.circuit_breaker import OPEN, ENDPOINT, KEY, REQUEST, get_breaker, key_fingerprint, classify_error
+from llm.cassette import RECORD, REPLAY, CassetteMissError, get_cassette, request_key
+from llm.budget import OK, DOWNGRADE, SKIP, HIGH, current_idea, get_ledger
+
+DEFAULT_TIERS = {
+    "fast": {"model": "llama3-8b-8192", "cost_per_1k_input": 0.0, "cost_per_1k_output": 0.0}
+}
+DEFAULT_ROUTE = {"tier": "fast", "max_tokens": 500, "temperature": 0.7, "priority": HIGH}
+
+
+class RouteStats:
+    """
+    Running latency, token and cost totals for a single route.
+    """
+    __slots__ = ("calls", "failures", "fallbacks", "latency", "prompt_tokens", "completion_tokens", "cost")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.fallbacks = 0
+        self.latency = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+    def record(self, latency, prompt_tokens, completion_tokens, cost):
+        with _stats_lock:
+            self.calls += 1
+            self.latency += latency
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += cost
+
+    def count(self, field):
+        with _stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def as_dict(self):
+        average = self.latency / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+            "avg_latency_s": round(average, 3),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": round(self.cost, 6),
+        }
+
+
+# Shared across every router in the process so a run can report all routes at once.
+# Agents send prompts from worker threads, so both are only touched under _stats_lock.
+_route_stats = {}
+_stats_lock = threading.Lock()
+
+# (idea_id, agent) pairs that were answered from the cache or a placeholder, until the pipeline collects them
+_degraded = set()
+
+# Last successful response per (route, prompt), served while a circuit is open
+_last_good = OrderedDict()
+LAST_GOOD_LIMIT = 1024
+
+
+def route_stats_summary():
+    """
+    Returns the latency/cost statistics collected for every route in this process.
+    """
+    with _stats_lock:
+        return {route: stats.as_dict() for route, stats in _route_stats.items()}
+
+
+def take_degraded(idea_id, agent):
+    """
+    Returns whether any of the agent's calls for the idea were served degraded, and forgets it.
+    """
+    with _stats_lock:
+        if (idea_id, agent) in _degraded:
+            _degraded.discard((idea_id, agent))
+            return True
+        return False
+
+
+def estimate_tokens(text):
+    # Roughly four characters per token for Llama-family tokenizers
+    return max(1, len(text or "") // 4)
+
+
+class LlamaRouter:
+    """
+    Routes each prompt type to a model tier with its own max_tokens and temperature.
+
+    Tiers and routes come from the ``llm`` section of config.yaml. When a tier
+    errors or times out the call is retried on the tier's configured ``fallback``.
+
+    Calls pass through circuit breakers for the endpoint and for the API key;
+    while either is open the router answers immediately from the last good
+    response for the prompt, or with None, and records the idea's section as
+    degraded (see ``take_degraded``).
+
+    The ``cassette`` setting records live traffic with its chunk timings or
+    replays earlier recordings instead of calling the API (see llm/cassette.py).
+
+    Token usage and cost are charged to the current idea (see ``idea_scope``),
+    the router's agent and its API key; budgets may shrink, downgrade or skip
+    low-priority routes (see llm/budget.py).
+    """
+
+    def __init__(self, client, llm_config=None, agent=None):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        llm_config = llm_config or {}
+        self.tiers = llm_config.get('tiers', DEFAULT_TIERS)
+        self.routes = llm_config.get('routes', {})
+        self.timeout = llm_config.get('timeout', 30)
+        self.agent = agent
+        self.cassette = get_cassette(llm_config.get('cassette'))
+        self.ledger = get_ledger(llm_config.get('budgets'))
+
+        breaker_config = llm_config.get('circuit_breaker', {})
+        endpoint = str(getattr(client, 'base_url', 'default'))
+        self.key_fingerprint = key_fingerprint(getattr(client, 'api_key', ''))
+        self.endpoint_breaker = get_breaker(f"endpoint:{endpoint}", **breaker_config)
+        self.key_breaker = get_breaker(f"key:{endpoint}:{self.key_fingerprint}", **breaker_config)
+
+    def resolve(self, route):
+        """
+        Returns the settings for a route, filling gaps from the ``default`` route.
+        """
+        settings = dict(DEFAULT_ROUTE)
+        settings.update(self.routes.get('default', {}))
+        settings.update(self.routes.get(route, {}))
+        return settings
+
+    def tier_chain(self, tier_name):
+        """
+        Returns the tier followed by its fallbacks, stopping at the first repeat.
+        """
+        chain = []
+        while tier_name and tier_name in self.tiers and tier_name not in chain:
+            chain.append(tier_name)
+            tier_name = self.tiers[tier_name].get('fallback')
+        return chain
+
+    def _tier_cost(self, tier_name):
+        tier = self.tiers[tier_name]
+        return tier.get('cost_per_1k_input', 0.0) + tier.get('cost_per_1k_output', 0.0)
+
+    def _circuit_allows(self):
+        if not self.endpoint_breaker.allow_request():
+            return False
+        if not self.key_breaker.allow_request():
+            self.endpoint_breaker.cancel_trial()
+            return False
+        return True
+
+    def _record_failure(self, error):
+        """
+        Charges a failed call to the endpoint or key breaker and returns its classification (None for cassette misses).
+        """
+        # Every branch settles the half-open trials granted by _circuit_allows
+        if isinstance(error, CassetteMissError):
+            # A missing recording says nothing about the endpoint's health
+            self.endpoint_breaker.cancel_trial()
+            self.key_breaker.cancel_trial()
+            # The recording may exist for a fallback tier, so the caller keeps falling back
+            return None
+        cause = classify_error(error)
+        if cause == ENDPOINT:
+            # The key was never checked, so its trial is handed back unused
+            self.endpoint_breaker.record_failure()
+            self.key_breaker.cancel_trial()
+        elif cause == KEY:
+            # The endpoint answered, so only the key is at fault
+            self.endpoint_breaker.record_success()
+            self.key_breaker.record_failure()
+        elif getattr(error, 'status_code', None) is not None:
+            # The API answered and accepted the key; the request itself was rejected
+            self.endpoint_breaker.record_success()
+            self.key_breaker.record_success()
+        else:
+            # Failed before reaching the API, so neither breaker learned anything
+            self.endpoint_breaker.cancel_trial()
+            self.key_breaker.cancel_trial()
+        return cause
+
+    def _serve_degraded(self, route, prompt):
+        idea_id = current_idea.get()
+        with _stats_lock:
+            cached = _last_good.get((route, prompt))
+            for idea in (idea_id if isinstance(idea_id, tuple) else (idea_id,)):
+                _degraded.add((idea, self.agent))
+        self.logger.warning(
+            f"Route {route} degraded: LLM unavailable, serving {'cached' if cached else 'placeholder'} section"
+        )
+        return cached
+
+    def send(self, route, prompt, max_tokens=None, temperature=None):
+        """
+        Sends a prompt on the given route and returns the response text, or None if every tier failed.
+        """
+        settings = self.resolve(route)
+        if max_tokens is None:
+            max_tokens = settings['max_tokens']
+        if temperature is None:
+            temperature = settings['temperature']
+        with _stats_lock:
+            stats = _route_stats.setdefault(route, RouteStats())
+        messages = [{"role": "user", "content": prompt}]
+        # Recordings are keyed on the request as configured, before budgets or fallbacks adjust it,
+        # so whether a replay hits never depends on ledger state
+        configured_model = self.tiers.get(settings['tier'], {}).get('model', settings['tier'])
+        cassette_key = request_key(configured_model, messages, temperature, max_tokens)
+
+        idea_id = current_idea.get()
+        action, max_tokens, tier_name = self.ledger.plan(
+            idea_id, settings['priority'], estimate_tokens(prompt) + max_tokens, max_tokens, settings['tier']
+        )
+        if action == SKIP:
+            self.ledger.record_skip(idea_id, self.agent)
+            self.logger.warning(f"Route {route} skipped for idea_id {idea_id}: token/cost budget exhausted")
+            return None
+        if action != OK:
+            self.logger.info(f"Route {route} budget action '{action}': tier {tier_name}, max_tokens {max_tokens}")
+
+        chain = self.tier_chain(tier_name)
+        if action == DOWNGRADE and chain:
+            # A downgraded call must not fall back to a tier that costs more than the cheap one
+            chain = [name for name in chain if self._tier_cost(name) <= self._tier_cost(chain[0])]
+
+        for attempt, tier_name in enumerate(chain):
+            # Each attempt takes its own trial, since a failed attempt settles the previous one
+            if not self._circuit_allows():
+                break
+            tier = self.tiers[tier_name]
+            if attempt:
+                stats.count('fallbacks')
+                self.logger.warning(f"Route {route} falling back to tier {tier_name}")
+            start = time.perf_counter()
+            try:
+                response_text, usage = self._complete(tier['model'], messages, max_tokens, temperature, cassette_key)
+            except Exception as e:
+                stats.count('failures')
+                self.logger.error(f"Route {route} failed on tier {tier_name} ({tier['model']}): {e}")
+                if self._record_failure(e) == REQUEST:
+                    # Another tier would reject the same request, and the LLM itself is available
+                    return None
+                if self.endpoint_breaker.state == OPEN or self.key_breaker.state == OPEN:
+                    # Every tier shares the endpoint and key, so further fallbacks would fail too
+                    break
+                continue
+
+            self.endpoint_breaker.record_success()
+            self.key_breaker.record_success()
+
+            latency = time.perf_counter() - start
+            prompt_tokens = usage.get('prompt_tokens') or estimate_tokens(prompt)
+            completion_tokens = usage.get('completion_tokens') or estimate_tokens(response_text)
+            cost = (prompt_tokens * tier.get('cost_per_1k_input', 0.0)
+                    + completion_tokens * tier.get('cost_per_1k_output', 0.0)) / 1000
+            stats.record(latency, prompt_tokens, completion_tokens, cost)
+            self.ledger.record(idea_id, self.agent, self.key_fingerprint, prompt_tokens, completion_tokens, cost)
+            self.logger.info(
+                f"Route {route} served by {tier['model']} in {latency:.2f}s "
+                f"({prompt_tokens}+{completion_tokens} tokens, ${cost:.6f})"
+            )
+            response_text = response_text.strip()
+            with _stats_lock:
+                _last_good[(route, prompt)] = response_text
+                if len(_last_good) > LAST_GOOD_LIMIT:
+                    _last_good.popitem(last=False)
+            return response_text
+
+        return self._serve_degraded(route, prompt)
+
+    def _complete(self, model, messages, max_tokens, temperature, cassette_key):
+        chunks = self._stream(model, messages, max_tokens, temperature, cassette_key)
+
+        # Collecting the streamed response; Groq reports usage on the final chunk
+        parts = []
+        usage = {}
+        for content, chunk_usage in chunks:
+            parts.append(content)
+            if chunk_usage:
+                usage = chunk_usage
+        return "".join(parts), usage
+
+    def _stream(self, model, messages, max_tokens, temperature, cassette_key):
+        """
+        Returns an iterator of ``(content, usage)`` chunks, live or from the cassette.
+        """
+        if self.cassette.mode == REPLAY:
+            return self.cassette.replay(cassette_key)
+
+        chunks = self._stream_live(model, messages, max_tokens, temperature)
+        if self.cassette.mode == RECORD:
+            # The request actually sent (after budget and fallback changes) is kept with the recording
+            return self.cassette.record(cassette_key, model, messages, chunks, max_tokens=max_tokens)
+        return chunks
+
+    def _stream_live(self, model, messages, max_tokens, temperature):
+        completion = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=1,
+            stream=True,
+            timeout=self.timeout
+        )
+        for chunk in completion:
+            content = (chunk.choices[0].delta.content or "") if chunk.choices else ""
+            usage = None
+            x_groq = getattr(chunk, 'x_groq', None)
+            if x_groq is not None and getattr(x_groq, 'usage', None) is not None:
+                usage = {
+                    'prompt_tokens': x_groq.usage.prompt_tokens,
+                    'completion_tokens': x_groq.usage.completion_tokens,
+                }
+            yield content, usage
@@ -1,12 +1,18 @@
 # main.py
 
+import json
 import yaml
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from agents.legal_agent.legal_agent import LegalAgent
 from agents.economics_agent.economics_agent import EconomicsAgent
 from agents.buisness_structure_agent.buisness_structure_agent import BusinessStructureAgent
 from agents.generalised_agent.generalised_agent import GeneralizedAgent
-from storage.storage import Storage
+from agents.results import AnalysisResult
+from storage.storage import Storage, READY, FAILED, DEGRADED
+from llm.router import route_stats_summary, take_degraded
+from llm.circuit_breaker import open_circuits
+from llm.budget import idea_scope, get_ledger
 from dotenv import load_dotenv  # For loading environment variables from .env file
 
 
@@ -44,32 +50,66 @@ def main():
 
     idea_id = "idea_007"  # Unique identifier for the startup idea
 
-    # Initialize and run LegalAgent
-    legal_agent = LegalAgent(config_path='config/config.yaml')
-    legal_analysis = legal_agent.process(user_input)
-    storage.store_output(agent_type="Legal", output_data=legal_analysis, idea_id=idea_id)
-    logger.info("Legal analysis stored successfully.")
+    # Record the idea's inputs as search facets
+    storage.store_metadata(user_input, idea_id)
 
-    # Initialize and run EconomicsAgent
-    economics_agent = EconomicsAgent(config_path='config/config.yaml')
-    economic_analysis = economics_agent.process(input_data=user_input)
-    storage.store_output(agent_type="Economics", output_data=economic_analysis, idea_id=idea_id)
-    logger.info("Economic analysis stored successfully.")
+    # Register the sections this run will produce so the app can show placeholders right away
+    storage.begin_run(idea_id, ["Legal", "Economics", "BusinessStructure", "ComprehensiveReport"])
 
-    # Initialize and run BusinessStructureAgent
-    business_structure_agent = BusinessStructureAgent(config_path='config/config.yaml')
-    business_structure_analysis = business_structure_agent.process(input_data=user_input)
-    storage.store_output(agent_type="BusinessStructure", output_data=business_structure_analysis, idea_id=idea_id)
-    logger.info("Business structure analysis stored successfully.")
+    # The Legal, Economics and BusinessStructure agents are independent: run them concurrently
+    # and publish each section as soon as its agent finishes
+    section_agents = {
+        "Legal": LegalAgent,
+        "Economics": EconomicsAgent,
+        "BusinessStructure": BusinessStructureAgent,
+    }
+
+    def run_agent(agent_class):
+        # Charge the agent's LLM calls to this idea's token/cost budget
+        with idea_scope(idea_id):
+            return agent_class(config_path='config/config.yaml').process(input_data=user_input)
+
+    max_workers = config['langgraph'].get('resources', {}).get('max_workers', len(section_agents))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_agent, agent_class): agent_type
+            for agent_type, agent_class in section_agents.items()
+        }
+        for future in as_completed(futures):
+            agent_type = futures[future]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                logger.error(f"{agent_type} agent failed: {e}")
+                analysis = f"An error occurred during {agent_type} analysis."
+            status = READY if isinstance(analysis, AnalysisResult) else FAILED
+            if status == READY and take_degraded(idea_id, agent_type):
+                status = DEGRADED
+            storage.store_output(agent_type=agent_type, output_data=analysis, idea_id=idea_id, status=status)
+            logger.info(f"{agent_type} analysis stored with status {status}.")
 
     # Initialize and run GeneralizedAgent
     generalized_agent = GeneralizedAgent(config_path='config/config.yaml')
-    comprehensive_report = generalized_agent.process(storage, idea_id)
-    storage.store_output(agent_type="ComprehensiveReport", output_data=comprehensive_report, idea_id=idea_id)
+    with idea_scope(idea_id):
+        comprehensive_report = generalized_agent.process(storage, idea_id)
+    report_status = DEGRADED if take_degraded(idea_id, "ComprehensiveReport") else READY
+    storage.store_output(agent_type="ComprehensiveReport", output_data=comprehensive_report, idea_id=idea_id,
+                         status=report_status)
     logger.info("Comprehensive report stored successfully.")
 
+    ledger = get_ledger(config.get('llm', {}).get('budgets'))
+    storage.store_usage(ledger.usage_for(idea_id), idea_id)
+    logger.info(f"Route statistics: {json.dumps(route_stats_summary())}")
+    logger.info(f"Token/cost usage: {json.dumps(ledger.summary())}")
+
+    degraded_circuits = open_circuits()
+    if degraded_circuits:
+        logger.warning(f"Run completed in degraded mode; open circuits: {degraded_circuits}")
+        print(f"WARNING: LLM endpoint unavailable ({', '.join(degraded_circuits)}); "
+              f"report contains cached or placeholder sections.")
+
     # Retrieve and print the comprehensive report
-    retrieved_report = storage.retrieve_outputs(idea_id).get("ComprehensiveReport", "No report found.")
+    retrieved_report = storage.retrieve_section(idea_id, "ComprehensiveReport", "No report found.")
     print("----- Comprehensive StartupGPT Report -----")
     print(retrieved_report)
 
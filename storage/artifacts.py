@@ -0,0 +1,193 @@
+import re
+import html
+import hashlib
+
+# Bump when the rendering output changes so cached artifacts are regenerated
+RENDERER_VERSION = 3
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+NUMBERED = re.compile(r"^(\s*)\d+[.)]\s+(.*)$")
+RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+BOLD = re.compile(r"\*\*(.+?)\*\*|(?<![\w_])__(.+?)__(?![\w_])")
+ITALIC = re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<![\w_])_(?!\s)(.+?)(?<!\s)_(?![\w_])")
+CODE = re.compile(r"`([^`]+)`")
+# The URL is either in angle brackets (raw or already escaped) or may contain balanced parentheses
+LINK = re.compile(
+    r"\[([^\]]+)\]\((?:(?:<|&lt;)([^<>\n]*?)(?:>|&gt;)|((?:[^()\s]|\([^()\s]*\))+))\)"
+)
+PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+
+
+def artifact_version(markdown):
+    """
+    Identifies the rendered artifacts of a report by its content and the renderer version.
+    """
+    digest = hashlib.sha256(markdown.encode('utf-8')).hexdigest()[:16]
+    return f"v{RENDERER_VERSION}-{digest}"
+
+
+def slugify(title, used):
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "section"
+    candidate = slug
+    counter = 2
+    while candidate in used:
+        candidate = f"{slug}-{counter}"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def _link_url(match):
+    angle_url, url = match.group(2), match.group(3)
+    return angle_url if angle_url is not None else url
+
+
+def _apply_inline(text, code, link, bold, italic):
+    """
+    Applies inline Markdown with the given renderers.
+
+    Code spans and links are swapped for placeholders before the emphasis
+    passes, so underscores or asterisks inside code and URLs are left alone.
+    """
+    text = text.replace("\x00", "")
+    protected = []
+
+    def protect(value):
+        protected.append(value)
+        return f"\x00{len(protected) - 1}\x00"
+
+    text = CODE.sub(lambda m: protect(code(m.group(1))), text)
+    text = LINK.sub(lambda m: protect(link(_emphasis(m.group(1), bold, italic), _link_url(m))), text)
+    text = _emphasis(text, bold, italic)
+    # Link labels may hold code placeholders, so restore until none are left
+    while PLACEHOLDER.search(text):
+        text = PLACEHOLDER.sub(lambda m: protected[int(m.group(1))], text)
+    return text
+
+
+def _emphasis(text, bold, italic):
+    text = BOLD.sub(lambda m: bold(m.group(1) or m.group(2)), text)
+    return ITALIC.sub(lambda m: italic(m.group(1) or m.group(2)), text)
+
+
+def _html_link(label, url):
+    if not re.match(r"^(https?:|mailto:)", html.unescape(url), re.IGNORECASE):
+        return label
+    return f'<a href="{url.replace(" ", "%20")}" rel="nofollow noopener" target="_blank">{label}</a>'
+
+
+def _inline(text):
+    """
+    Renders inline Markdown on already-escaped text. Only http(s) and mailto links are kept.
+    """
+    return _apply_inline(
+        text,
+        code=lambda body: f"<code>{body}</code>",
+        link=_html_link,
+        bold=lambda body: f"<strong>{body}</strong>",
+        italic=lambda body: f"<em>{body}</em>",
+    )
+
+
+def _strip_inline(text):
+    return _apply_inline(
+        text,
+        code=lambda body: body,
+        link=lambda label, url: f"{label} ({url})",
+        bold=lambda body: body,
+        italic=lambda body: body,
+    )
+
+
+def render_artifacts(markdown):
+    """
+    Renders a Markdown report into its pre-rendered artifacts.
+
+    The HTML is sanitized by construction: all report text is escaped and only
+    the tags emitted here (headings, paragraphs, lists, code, emphasis, safe
+    links) can appear, so raw HTML or scripts in LLM output are shown as text.
+
+    Returns:
+        dict: 'html' (str), 'toc' (list of {'level', 'title', 'anchor'}) and 'text' (str).
+    """
+    html_parts = []
+    text_parts = []
+    toc = []
+    used_anchors = set()
+    paragraph = []
+    open_list = None
+    in_code = False
+
+    def flush_paragraph():
+        if paragraph:
+            html_parts.append(f"<p>{'<br>'.join(_inline(line) for line in paragraph)}</p>")
+            paragraph.clear()
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            html_parts.append(f"</{open_list}>")
+            open_list = None
+
+    for raw_line in markdown.splitlines():
+        if raw_line.strip().startswith("```"):
+            flush_paragraph()
+            close_list()
+            html_parts.append("</code></pre>" if in_code else "<pre><code>")
+            in_code = not in_code
+            continue
+        if in_code:
+            html_parts.append(html.escape(raw_line))
+            text_parts.append(raw_line)
+            continue
+
+        line = html.escape(raw_line)
+        heading = HEADING.match(line)
+        bullet = BULLET.match(line)
+        numbered = NUMBERED.match(line)
+
+        if not line.strip():
+            flush_paragraph()
+            close_list()
+            text_parts.append("")
+        elif heading:
+            flush_paragraph()
+            close_list()
+            level = len(heading.group(1))
+            title = _strip_inline(html.unescape(heading.group(2)))
+            anchor = slugify(title, used_anchors)
+            toc.append({"level": level, "title": title, "anchor": anchor})
+            html_parts.append(f'<h{level} id="{anchor}">{_inline(heading.group(2))}</h{level}>')
+            text_parts.append(title.upper() if level <= 2 else title)
+        elif RULE.match(line):
+            flush_paragraph()
+            close_list()
+            html_parts.append("<hr>")
+            text_parts.append("-" * 40)
+        elif bullet or numbered:
+            flush_paragraph()
+            tag = "ul" if bullet else "ol"
+            if open_list != tag:
+                close_list()
+                html_parts.append(f"<{tag}>")
+                open_list = tag
+            indent, item = (bullet or numbered).groups()
+            html_parts.append(f"<li>{_inline(item)}</li>")
+            marker = "-" if bullet else raw_line.strip().split()[0]
+            text_parts.append(f"{indent}{marker} {_strip_inline(html.unescape(item))}")
+        else:
+            close_list()
+            paragraph.append(line.strip())
+            text_parts.append(_strip_inline(raw_line.strip()))
+
+    flush_paragraph()
+    close_list()
+    if in_code:
+        html_parts.append("</code></pre>")
+
+    return {
+        "html": "\n".join(html_parts) + "\n",
+        "toc": toc,
+        "text": "\n".join(text_parts).strip() + "\n",
+    }
@@ -0,0 +1,232 @@
+import sqlite3
+import hashlib
+import logging
+import itertools
+from contextlib import contextmanager
+
+FACETS = ("industry", "business_model", "company_size")
+
+# Bump when the table layout changes; older indexes are dropped and rebuilt from storage
+SCHEMA_VERSION = 2
+
+# Sections ranked per requested idea before grouping, bounding the work per search
+CANDIDATES_PER_RESULT = 10
+
+BATCH_SIZE = 500
+
+
+def flatten_text(value):
+    """
+    Collects the text in a stored section (plain text, wire-form results or nested JSON data).
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "\n".join(
+            f"{key} {flatten_text(item)}" if key not in ("k", "v") else flatten_text(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return "\n".join(flatten_text(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def to_match_query(query):
+    """
+    Turns free text into an FTS5 query: every word must match, the last one as a prefix.
+    """
+    words = [word.replace('"', '""') for word in query.split()]
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def facet_token(name, value):
+    """
+    Encodes an exact facet value as a single FTS token, so facet filters are part of the MATCH.
+    """
+    return "f" + hashlib.sha1(f"{name}={value}".encode('utf-8')).hexdigest()[:16]
+
+
+def facet_tokens(facets):
+    return " ".join(facet_token(name, facets[name]) for name in FACETS if facets.get(name))
+
+
+class SearchIndex:
+    """
+    Incrementally maintained full-text and facet index over stored sections.
+
+    Backed by an SQLite FTS5 table so searches are ranked (bm25) on disk and
+    never load stored reports into memory. ``Storage`` updates it on every write.
+
+    Each section row also carries its idea's facets as tokens, so facet filters
+    narrow the full-text match itself instead of filtering after ranking.
+    """
+
+    def __init__(self, index_file="storage/search.db"):
+        self.index_file = index_file
+        self.logger = logging.getLogger(__name__)
+        # Set when an index from an older layout was dropped; Storage then rebuilds it
+        self.needs_rebuild = False
+        with self._connect() as connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self.needs_rebuild = bool(connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sections'"
+                ).fetchone())
+                connection.execute("DROP TABLE IF EXISTS sections")
+                connection.execute("DROP TABLE IF EXISTS section_keys")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+                    idea_id UNINDEXED, agent_type UNINDEXED, body, facets, tokenize='porter unicode61', prefix='2 3 4'
+                );
+                CREATE TABLE IF NOT EXISTS section_keys (
+                    id INTEGER PRIMARY KEY, idea_id TEXT NOT NULL, agent_type TEXT NOT NULL,
+                    UNIQUE (idea_id, agent_type)
+                );
+                CREATE TABLE IF NOT EXISTS facets (
+                    idea_id TEXT PRIMARY KEY, industry TEXT, business_model TEXT, company_size TEXT
+                );
+                CREATE INDEX IF NOT EXISTS facets_industry ON facets(industry);
+                CREATE INDEX IF NOT EXISTS facets_business_model ON facets(business_model);
+                CREATE INDEX IF NOT EXISTS facets_company_size ON facets(company_size);
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the index safe to use from worker threads
+        connection = sqlite3.connect(self.index_file, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def update_section(self, idea_id, agent_type, output_data):
+        self.update_sections([(idea_id, agent_type, output_data)])
+
+    def update_sections(self, sections):
+        """
+        Indexes ``(idea_id, agent_type, output)`` tuples in batches, one connection and transaction overall.
+        """
+        sections = iter(sections)
+        count = 0
+        with self._connect() as connection:
+            while True:
+                batch = [
+                    (idea_id, agent_type, flatten_text(output_data))
+                    for idea_id, agent_type, output_data in itertools.islice(sections, BATCH_SIZE)
+                ]
+                if not batch:
+                    break
+                self._write_batch(connection, batch)
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _write_batch(connection, batch):
+        keys = [(idea_id, agent_type) for idea_id, agent_type, _ in batch]
+        idea_ids = sorted({idea_id for idea_id, _ in keys})
+        placeholders = ",".join("?" * len(idea_ids))
+        tokens = {
+            row[0]: facet_tokens(dict(zip(FACETS, row[1:])))
+            for row in connection.execute(
+                f"SELECT idea_id, {', '.join(FACETS)} FROM facets WHERE idea_id IN ({placeholders})", idea_ids
+            )
+        }
+        # section_keys pins each (idea, section) to an FTS rowid so replacing it is an indexed lookup
+        connection.executemany("INSERT OR IGNORE INTO section_keys (idea_id, agent_type) VALUES (?, ?)", keys)
+        connection.executemany(
+            "DELETE FROM sections WHERE rowid = "
+            "(SELECT id FROM section_keys WHERE idea_id = ? AND agent_type = ?)", keys
+        )
+        connection.executemany(
+            "INSERT INTO sections (rowid, idea_id, agent_type, body, facets) "
+            "SELECT id, idea_id, agent_type, ?, ? FROM section_keys WHERE idea_id = ? AND agent_type = ?",
+            [(body, tokens.get(idea_id, ""), idea_id, agent_type) for idea_id, agent_type, body in batch]
+        )
+
+    def set_facets(self, idea_id, industry=None, business_model=None, company_size=None):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO facets (idea_id, industry, business_model, company_size) VALUES (?, ?, ?, ?)",
+                (idea_id, industry, business_model, company_size)
+            )
+            tokens = facet_tokens(
+                {"industry": industry, "business_model": business_model, "company_size": company_size}
+            )
+            connection.execute(
+                "UPDATE sections SET facets = ? WHERE rowid IN (SELECT id FROM section_keys WHERE idea_id = ?)",
+                (tokens, idea_id)
+            )
+
+    def remove_idea(self, idea_id):
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM sections WHERE rowid IN (SELECT id FROM section_keys WHERE idea_id = ?)", (idea_id,)
+            )
+            connection.execute("DELETE FROM section_keys WHERE idea_id = ?", (idea_id,))
+            connection.execute("DELETE FROM facets WHERE idea_id = ?", (idea_id,))
+
+    def search(self, query="", limit=20, **facets):
+        """
+        Returns ideas matching the query and facet filters, best match first.
+
+        Args:
+            query (str): Free text; every word must appear in the same section of the idea.
+            limit (int): Maximum number of ideas to return.
+            **facets: Optional exact filters on industry, business_model and company_size.
+
+        Returns:
+            list: Dicts with 'idea_id', 'score' (higher is better) and 'sections' (matching agent types).
+        """
+        match_query = to_match_query(query or "")
+        with self._connect() as connection:
+            if match_query is None:
+                filters = [f"{name} = ?" for name in FACETS if facets.get(name)]
+                where = f"WHERE {' AND '.join(filters)}" if filters else ""
+                rows = connection.execute(
+                    f"SELECT idea_id, 0.0, '' FROM facets {where} ORDER BY idea_id LIMIT ?",
+                    (*[facets[name] for name in FACETS if facets.get(name)], limit)
+                ).fetchall()
+            else:
+                tokens = facet_tokens(facets)
+                if tokens:
+                    match_query = f"body : ({match_query}) AND facets : ({tokens})"
+                else:
+                    match_query = f"body : ({match_query})"
+                # Only the best-ranked sections are grouped, so the cost does not grow with every match
+                rows = connection.execute(
+                    """
+                    SELECT idea_id, -MIN(rank) AS score, GROUP_CONCAT(agent_type)
+                    FROM (
+                        SELECT idea_id, agent_type, rank FROM sections WHERE sections MATCH ?
+                        ORDER BY rank LIMIT ?
+                    )
+                    GROUP BY idea_id
+                    ORDER BY score DESC
+                    LIMIT ?
+                    """,
+                    (match_query, limit * CANDIDATES_PER_RESULT, limit)
+                ).fetchall()
+        return [
+            {"idea_id": idea_id, "score": round(score, 4), "sections": sections.split(",") if sections else []}
+            for idea_id, score, sections in rows
+        ]
+
+    def facet_values(self, name):
+        """
+        Returns ``[(value, idea count), ...]`` for a facet, most common first.
+        """
+        if name not in FACETS:
+            raise ValueError(f"Unknown facet: {name}")
+        with self._connect() as connection:
+            return connection.execute(
+                f"SELECT {name}, COUNT(*) FROM facets WHERE {name} IS NOT NULL "
+                f"GROUP BY {name} ORDER BY COUNT(*) DESC, {name}"
+            ).fetchall()
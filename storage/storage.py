@@ -1,55 +1,618 @@
 import json
 import os
+import sys
+import zlib
+import hashlib
 import logging
+import argparse
+import time
+import threading
+from .search_index import SearchIndex
+from .artifacts import render_artifacts, artifact_version
+
+INDEX_VERSION = 3
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+# Stored, but some of it is cached or placeholder text served while the LLM was unavailable
+DEGRADED = "degraded"
+
+# compact leaves blobs and artifacts this recent alone: another process may be about to reference them
+COMPACT_GRACE_SECONDS = 3600
+
+REPORT_AGENT = "ComprehensiveReport"
+ARTIFACT_FILES = {"html": "report.html", "toc": "toc.json", "text": "report.txt"}
+
 
 class Storage:
-    def __init__(self, storage_file="storage/data.json"):
+    """
+    Stores agent outputs for each idea.
+
+    Section bodies are kept as zlib-compressed, content-addressed blobs under
+    ``<storage dir>/blobs``, so identical sections (fallback messages, shared
+    industry data) are written to disk once. Each idea has a small manifest
+    under ``<storage dir>/ideas`` mapping its sections to blob hashes, with
+    their statuses, usage and report artifact version; reading or writing an
+    idea only touches its own manifest, however many ideas are stored. The
+    storage file itself only records the layout version.
+
+    Analysis results are stored in their compact wire form (``to_wire()``) and
+    returned as that plain dict; ``agents.results.from_wire`` rebuilds them.
+
+    Every write also records the section's status and bumps a per-idea change
+    version kept in a tiny file under ``<storage dir>/versions``, so readers can
+    poll ``get_version`` cheaply and only reload an idea when it changed.
+
+    Writes also update a full-text/facet ``SearchIndex`` next to the storage file.
+
+    Storing a ``ComprehensiveReport`` pre-renders it (sanitized HTML, table of
+    contents, plain text) into ``<storage dir>/artifacts/<idea>/<version>`` so
+    readers serve the rendered bytes instead of converting Markdown per request.
+    """
+
+    def __init__(self, storage_file="storage/data.json", blob_dir=None):
         self.storage_file = storage_file
+        storage_dir = os.path.dirname(storage_file) or "."
+        self.blob_dir = blob_dir or os.path.join(storage_dir, "blobs")
+        self.manifest_dir = os.path.join(storage_dir, "ideas")
+        self.version_dir = os.path.join(storage_dir, "versions")
+        self.artifact_dir = os.path.join(storage_dir, "artifacts")
+        self.sweep_dir = os.path.join(storage_dir, "sweeps")
+        self.search_index = SearchIndex(os.path.join(storage_dir, "search.db"))
         self.logger = logging.getLogger(__name__)
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w') as f:
-                json.dump({}, f)
+        # Agents publish sections from worker threads; manifest updates are read-modify-write
+        self._lock = threading.RLock()
+        for directory in (self.blob_dir, self.manifest_dir, self.version_dir, self.artifact_dir, self.sweep_dir):
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._migrate()
+            if self.search_index.needs_rebuild:
+                self.logger.info("Search index layout changed; rebuilding it from stored sections.")
+                self.reindex()
 
-    def store_output(self, agent_type, output_data, idea_id):
-        try:
+    def _migrate(self):
+        """
+        Moves a legacy storage file into per-idea manifests, once, and rewrites it as a version marker.
+
+        Migrated sections are added to the search index and migrated reports are
+        pre-rendered, so they are searchable and served from artifacts right away.
+        """
+        if os.path.exists(self.storage_file):
             with open(self.storage_file, 'r') as f:
                 data = json.load(f)
-            if idea_id not in data:
-                data[idea_id] = {}
-            data[idea_id][agent_type] = output_data
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=4)
+            if data.get("version") == INDEX_VERSION:
+                return
+            if data.get("version") == 2:
+                self._migrate_index(data)
+            else:
+                self._migrate_legacy(data)
+            self.reindex()
+            self.render_reports()
+        self._write_json(self.storage_file, {"version": INDEX_VERSION})
+
+    def _migrate_legacy(self, data):
+        """
+        Converts the original ``{idea_id: {agent_type: output}}`` layout into blobs and manifests.
+        """
+        self.logger.info(f"Migrating {len(data)} ideas from the legacy storage file to blobs.")
+        for idea_id, outputs in data.items():
+            manifest = self._empty_manifest(idea_id)
+            for agent_type, output_data in outputs.items():
+                manifest["sections"][agent_type] = self._put_blob(output_data)
+            self._write_manifest(manifest)
+
+    def _migrate_index(self, index):
+        """
+        Splits the single blob index used before per-idea manifests into one manifest per idea.
+        """
+        self.logger.info(f"Migrating {len(index['ideas'])} ideas from the storage index to manifests.")
+        for idea_id in set(index["ideas"]) | set(index.get("status", {})):
+            manifest = self._empty_manifest(idea_id)
+            manifest["sections"] = index["ideas"].get(idea_id, {})
+            manifest["status"] = index.get("status", {}).get(idea_id, {})
+            manifest["usage"] = index.get("usage", {}).get(idea_id, {})
+            manifest["artifact"] = index.get("artifacts", {}).get(idea_id)
+            self._write_manifest(manifest)
+
+    @staticmethod
+    def _write_json(path, data):
+        # Write to a temporary file first so a crash never leaves a truncated file
+        tmp_file = f"{path}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_file, path)
+
+    @staticmethod
+    def _idea_key(idea_id):
+        return hashlib.sha1(idea_id.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _empty_manifest(idea_id):
+        return {"idea_id": idea_id, "sections": {}, "status": {}, "usage": {}, "artifact": None}
+
+    def _manifest_path(self, idea_id):
+        return os.path.join(self.manifest_dir, f"{self._idea_key(idea_id)}.json")
+
+    def _load_manifest(self, idea_id):
+        try:
+            with open(self._manifest_path(idea_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._empty_manifest(idea_id)
+
+    def _write_manifest(self, manifest):
+        self._write_json(self._manifest_path(manifest["idea_id"]), manifest)
+
+    def _manifests(self):
+        """
+        Yields every idea's manifest; used by maintenance commands, never on the request path.
+        """
+        for name in sorted(os.listdir(self.manifest_dir)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.manifest_dir, name), 'r') as f:
+                    yield json.load(f)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.zz")
+
+    def _put_blob(self, output_data):
+        payload = json.dumps(output_data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._blob_path(digest)
+        try:
+            # Reusing a blob refreshes its mtime so a concurrent compact treats it as new
+            os.utime(path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(payload, 6))
+            os.replace(tmp_path, path)
+        return digest
+
+    def _get_blob(self, digest):
+        with open(self._blob_path(digest), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+    def _version_path(self, idea_id):
+        return os.path.join(self.version_dir, self._idea_key(idea_id))
+
+    def _bump_version(self, idea_id):
+        version = self.get_version(idea_id) + 1
+        path = self._version_path(idea_id)
+        with open(f"{path}.tmp", 'w') as f:
+            f.write(str(version))
+        os.replace(f"{path}.tmp", path)
+        return version
+
+    def get_version(self, idea_id):
+        """
+        Returns the idea's change version (0 if it was never written) without loading its manifest.
+        """
+        try:
+            with open(self._version_path(idea_id), 'r') as f:
+                return int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _resolve(self, manifest, exclude=()):
+        outputs = {}
+        for agent_type, digest in manifest["sections"].items():
+            if agent_type in exclude:
+                continue
+            try:
+                outputs[agent_type] = self._get_blob(digest)
+            except FileNotFoundError:
+                # One lost section should not hide the rest of the idea
+                self.logger.error(f"Missing blob {digest} for {agent_type} of idea_id {manifest['idea_id']}")
+        return outputs
+
+    def _artifact_path(self, idea_id, version, kind):
+        return os.path.join(self.artifact_dir, self._idea_key(idea_id), version, ARTIFACT_FILES[kind])
+
+    def _write_artifacts(self, idea_id, markdown):
+        """
+        Renders the report and writes its artifacts unless this version already exists. Returns the version.
+        """
+        version = artifact_version(markdown)
+        if os.path.exists(self._artifact_path(idea_id, version, "text")):
+            # Refresh the mtime so a concurrent compact does not drop a version about to become current again
+            os.utime(os.path.dirname(self._artifact_path(idea_id, version, "text")))
+            return version
+        artifacts = render_artifacts(markdown)
+        payloads = {
+            "html": artifacts["html"].encode('utf-8'),
+            "toc": json.dumps(artifacts["toc"], ensure_ascii=False).encode('utf-8'),
+            "text": artifacts["text"].encode('utf-8'),
+        }
+        os.makedirs(os.path.dirname(self._artifact_path(idea_id, version, "text")), exist_ok=True)
+        # The text export is written last, so its presence marks a complete version
+        for kind in ("html", "toc", "text"):
+            path = self._artifact_path(idea_id, version, kind)
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(payloads[kind])
+            os.replace(f"{path}.tmp", path)
+        return version
+
+    def store_output(self, agent_type, output_data, idea_id, status=READY):
+        try:
+            # Blob and search index both take the wire form, so indexed text is the same as after a reindex
+            if hasattr(output_data, 'to_wire'):
+                output_data = output_data.to_wire()
+            version = None
+            if agent_type == REPORT_AGENT and isinstance(output_data, str):
+                version = self._write_artifacts(idea_id, output_data)
+            with self._lock:
+                manifest = self._load_manifest(idea_id)
+                manifest["sections"][agent_type] = self._put_blob(output_data)
+                manifest["status"][agent_type] = status
+                if version:
+                    manifest["artifact"] = version
+                self._write_manifest(manifest)
+                self._bump_version(idea_id)
+            self.search_index.update_section(idea_id, agent_type, output_data)
             self.logger.info(f"Stored {agent_type} output for idea_id: {idea_id}")
         except Exception as e:
             self.logger.error(f"Failed to store output: {e}")
 
+    def begin_run(self, idea_id, agent_types):
+        """
+        Marks the sections a run will produce as pending so readers can show placeholders.
+
+        The run's start time is kept with them, so readers can tell a run that
+        crashed (sections pending for too long) from one still in progress.
+        """
+        try:
+            with self._lock:
+                manifest = self._load_manifest(idea_id)
+                for agent_type in agent_types:
+                    manifest["status"][agent_type] = PENDING
+                manifest["run_started_at"] = time.time()
+                self._write_manifest(manifest)
+                self._bump_version(idea_id)
+        except Exception as e:
+            self.logger.error(f"Failed to start run for idea_id {idea_id}: {e}")
+
+    def section_status(self, idea_id):
+        """
+        Returns ``{agent_type: status}`` for the idea. Sections stored before statuses existed count as ready.
+        """
+        try:
+            manifest = self._load_manifest(idea_id)
+            statuses = {agent_type: READY for agent_type in manifest["sections"]}
+            statuses.update(manifest["status"])
+            return statuses
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve section status: {e}")
+            return {}
+
+    def retrieve_idea(self, idea_id, exclude=()):
+        """
+        Loads everything a reader needs about an idea from a single manifest read.
+
+        Args:
+            exclude (iterable): Agent types whose bodies are not loaded, e.g. a report served from its artifacts.
+
+        Returns:
+            tuple: ``(statuses, outputs, artifact version, run start)`` as returned by ``section_status``,
+            ``retrieve_outputs`` and ``artifact_version``, plus the ``time.time()`` of the last
+            ``begin_run`` (None if the idea never had one).
+        """
+        try:
+            manifest = self._load_manifest(idea_id)
+            statuses = {agent_type: READY for agent_type in manifest["sections"]}
+            statuses.update(manifest["status"])
+            return (statuses, self._resolve(manifest, exclude), manifest.get("artifact"),
+                    manifest.get("run_started_at"))
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve idea_id {idea_id}: {e}")
+            return {}, {}, None, None
+
     def retrieve_outputs(self, idea_id):
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
-            return data.get(idea_id, {})
+            return self._resolve(self._load_manifest(idea_id))
         except Exception as e:
             self.logger.error(f"Failed to retrieve outputs: {e}")
             return {}
 
+    def retrieve_section(self, idea_id, agent_type, default=None):
+        """
+        Loads a single section without decompressing the rest of the idea's outputs.
+        """
+        try:
+            digest = self._load_manifest(idea_id)["sections"].get(agent_type)
+            if digest is None:
+                return default
+            return self._get_blob(digest)
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {agent_type} for idea_id {idea_id}: {e}")
+            return default
+
+    def artifact_version(self, idea_id):
+        """
+        Returns the version of the idea's pre-rendered report artifacts, or None if there are none.
+        """
+        try:
+            return self._load_manifest(idea_id).get("artifact")
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve artifact version: {e}")
+            return None
+
+    def retrieve_artifact(self, idea_id, kind, version=None):
+        """
+        Returns the pre-rendered report artifact as bytes.
+
+        Args:
+            kind (str): 'html' (sanitized HTML), 'toc' (JSON table of contents) or 'text' (plain-text export).
+            version (str): Artifact version to read; defaults to the current one.
+
+        Returns:
+            bytes: The artifact, or None if the report has not been rendered.
+        """
+        try:
+            version = version or self.artifact_version(idea_id)
+            if version is None:
+                return None
+            with open(self._artifact_path(idea_id, version, kind), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {kind} artifact for idea_id {idea_id}: {e}")
+            return None
+
+    def render_reports(self):
+        """
+        Renders artifacts for every stored report that is missing them or was rendered by an older renderer.
+        """
+        rendered = 0
+        with self._lock:
+            for manifest in self._manifests():
+                digest = manifest["sections"].get(REPORT_AGENT)
+                if digest is None:
+                    continue
+                markdown = self._get_blob(digest)
+                if not isinstance(markdown, str):
+                    continue
+                version = self._write_artifacts(manifest["idea_id"], markdown)
+                if manifest.get("artifact") != version:
+                    manifest["artifact"] = version
+                    self._write_manifest(manifest)
+                    rendered += 1
+        self.logger.info(f"Rendered artifacts for {rendered} reports")
+        return {"rendered_reports": rendered}
+
+    def store_metadata(self, metadata, idea_id):
+        """
+        Records the idea's inputs (industry, business model, company size) as search facets.
+        """
+        try:
+            self.search_index.set_facets(
+                idea_id,
+                industry=metadata.get('industry'),
+                business_model=metadata.get('business_model') or metadata.get('business_model_type'),
+                company_size=metadata.get('company_size')
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to store metadata: {e}")
+
+    def search(self, query="", limit=20, **facets):
+        """
+        Searches stored sections; see ``SearchIndex.search``.
+        """
+        try:
+            return self.search_index.search(query, limit=limit, **facets)
+        except Exception as e:
+            self.logger.error(f"Search failed: {e}")
+            return []
+
+    def reindex(self):
+        """
+        Rebuilds the section search index from stored blobs. Facets are kept.
+        """
+        count = self.search_index.update_sections(
+            (manifest["idea_id"], agent_type, self._get_blob(digest))
+            for manifest in self._manifests()
+            for agent_type, digest in manifest["sections"].items()
+        )
+        self.logger.info(f"Reindexed {count} sections")
+        return {"indexed_sections": count}
+
+    def store_usage(self, usage, idea_id):
+        """
+        Stores the idea's token/cost accounting in its manifest next to its section references.
+        """
+        try:
+            with self._lock:
+                manifest = self._load_manifest(idea_id)
+                manifest["usage"] = usage
+                self._write_manifest(manifest)
+            self.logger.info(f"Stored usage for idea_id: {idea_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to store usage: {e}")
+
+    def retrieve_usage(self, idea_id):
+        try:
+            return self._load_manifest(idea_id)["usage"]
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve usage: {e}")
+            return {}
+
+    def _sweep_path(self, sweep_id):
+        return os.path.join(self.sweep_dir, f"{self._idea_key(sweep_id)}.md")
+
+    def store_sweep(self, sweep_id, comparison):
+        """
+        Stores a scenario sweep's comparison table. Sweeps are kept apart from ideas, so they never show up as sections.
+        """
+        try:
+            path = self._sweep_path(sweep_id)
+            with open(f"{path}.tmp", 'w') as f:
+                f.write(comparison)
+            os.replace(f"{path}.tmp", path)
+            self.logger.info(f"Stored sweep comparison for: {sweep_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to store sweep comparison: {e}")
+
+    def retrieve_sweep(self, sweep_id):
+        try:
+            with open(self._sweep_path(sweep_id), 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve sweep comparison: {e}")
+            return None
+
     def store_report(self, report_content, idea_id):
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
-            if idea_id not in data:
-                data[idea_id] = {}
-            data[idea_id]['report'] = report_content
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=4)
+            with self._lock:
+                manifest = self._load_manifest(idea_id)
+                manifest["sections"]['report'] = self._put_blob(report_content)
+                self._write_manifest(manifest)
+                self._bump_version(idea_id)
+            self.search_index.update_section(idea_id, 'report', report_content)
             self.logger.info(f"Stored report for idea_id: {idea_id}")
         except Exception as e:
             self.logger.error(f"Failed to store report: {e}")
 
     def retrieve_report(self, idea_id):
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
-            return data.get(idea_id, {}).get('report', "No report available.")
+            return self.retrieve_section(idea_id, 'report', "No report available.")
         except Exception as e:
             self.logger.error(f"Failed to retrieve report: {e}")
             return "Error retrieving report."
+
+    def delete_idea(self, idea_id):
+        """
+        Drops an idea's manifest. Its blobs and artifacts are reclaimed by ``compact``.
+        """
+        try:
+            with self._lock:
+                try:
+                    os.remove(self._manifest_path(idea_id))
+                except FileNotFoundError:
+                    pass
+                self._bump_version(idea_id)
+            self.search_index.remove_idea(idea_id)
+            self.logger.info(f"Deleted outputs for idea_id: {idea_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to delete idea: {e}")
+
+    def _remove_stale_artifacts(self, current, cutoff):
+        removed = 0
+        reclaimed = 0
+        for idea_key in os.listdir(self.artifact_dir):
+            idea_dir = os.path.join(self.artifact_dir, idea_key)
+            if not os.path.isdir(idea_dir):
+                continue
+            for version in os.listdir(idea_dir):
+                version_dir = os.path.join(idea_dir, version)
+                if current.get(idea_key) == version or os.path.getmtime(version_dir) > cutoff:
+                    continue
+                for name in os.listdir(version_dir):
+                    path = os.path.join(version_dir, name)
+                    reclaimed += os.path.getsize(path)
+                    os.remove(path)
+                os.rmdir(version_dir)
+                removed += 1
+            if not os.listdir(idea_dir) and os.path.getmtime(idea_dir) <= cutoff:
+                os.rmdir(idea_dir)
+        return removed, reclaimed
+
+    def compact(self, grace_seconds=COMPACT_GRACE_SECONDS):
+        """
+        Deletes blobs no manifest references and stale report artifacts (mark and sweep).
+
+        Only the in-process lock is held, so writers in other processes may be
+        between writing a blob and referencing it from their manifest. Blobs and
+        artifacts written or reused within ``grace_seconds`` are therefore kept.
+
+        Returns:
+            dict: Counts of live blobs, removed blobs, removed artifact versions and bytes reclaimed.
+        """
+        cutoff = time.time() - grace_seconds
+        with self._lock:
+            live = set()
+            current_artifacts = {}
+            for manifest in self._manifests():
+                live.update(manifest["sections"].values())
+                if manifest.get("artifact"):
+                    current_artifacts[self._idea_key(manifest["idea_id"])] = manifest["artifact"]
+
+            removed = 0
+            reclaimed = 0
+            for shard in os.listdir(self.blob_dir):
+                shard_dir = os.path.join(self.blob_dir, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for name in os.listdir(shard_dir):
+                    digest = name.split('.', 1)[0]
+                    if digest in live and name.endswith('.zz'):
+                        continue
+                    path = os.path.join(shard_dir, name)
+                    try:
+                        if os.path.getmtime(path) > cutoff:
+                            continue
+                        reclaimed += os.path.getsize(path)
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+
+            removed_artifacts, artifact_bytes = self._remove_stale_artifacts(current_artifacts, cutoff)
+            reclaimed += artifact_bytes
+
+        self.logger.info(f"Compacted storage: removed {removed} blobs and {removed_artifacts} "
+                         f"artifact versions ({reclaimed} bytes)")
+        return {
+            "live_blobs": len(live),
+            "removed_blobs": removed,
+            "removed_artifacts": removed_artifacts,
+            "reclaimed_bytes": reclaimed,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StartupGPT storage maintenance")
+    parser.add_argument("--storage-file", default="storage/data.json")
+    parser.add_argument("--grace-seconds", type=int, default=COMPACT_GRACE_SECONDS,
+                        help="compact keeps unreferenced blobs and artifacts newer than this")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("compact", help="Delete blobs and report artifacts no idea references")
+    delete_parser = subparsers.add_parser("delete", help="Remove an idea and compact storage")
+    delete_parser.add_argument("idea_id")
+    subparsers.add_parser("reindex", help="Rebuild the full-text search index from stored sections")
+    subparsers.add_parser("render", help="Pre-render report artifacts missing for stored reports")
+    search_parser = subparsers.add_parser("search", help="Search stored reports")
+    search_parser.add_argument("query", nargs="?", default="")
+    search_parser.add_argument("--industry")
+    search_parser.add_argument("--business-model")
+    search_parser.add_argument("--company-size")
+    search_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    storage = Storage(storage_file=args.storage_file)
+    if args.command == "reindex":
+        print(json.dumps(storage.reindex()))
+        return 0
+    if args.command == "render":
+        print(json.dumps(storage.render_reports()))
+        return 0
+    if args.command == "search":
+        results = storage.search(
+            args.query, limit=args.limit, industry=args.industry,
+            business_model=args.business_model, company_size=args.company_size
+        )
+        print(json.dumps(results, indent=4))
+        return 0
+    if args.command == "delete":
+        storage.delete_idea(args.idea_id)
+    stats = storage.compact(grace_seconds=args.grace_seconds)
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
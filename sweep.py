@@ -0,0 +1,296 @@
+# sweep.py
+
+import json
+import yaml
+import logging
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from agents.legal_agent.legal_agent import LegalAgent
+from agents.economics_agent.economics_agent import EconomicsAgent
+from agents.buisness_structure_agent.buisness_structure_agent import BusinessStructureAgent
+from agents.generalised_agent.generalised_agent import GeneralizedAgent
+from agents.results import AnalysisResult
+from storage.storage import Storage, READY, FAILED, DEGRADED
+from llm.router import take_degraded
+from llm.budget import idea_scope, get_ledger, current_idea, current_charges
+from main import setup_logging
+from dotenv import load_dotenv
+
+SECTION_AGENTS = {
+    "Legal": LegalAgent,
+    "Economics": EconomicsAgent,
+    "BusinessStructure": BusinessStructureAgent,
+}
+
+# Inputs a variant can change; business_model feeds both the Economics/Legal and BusinessStructure agents
+INPUT_FIELDS = ("industry", "business_model", "business_model_type", "company_size")
+
+
+class ProbeValue(str):
+    """
+    Stand-in for a helper result during dependency probing; carries the sentinels of its inputs.
+    """
+
+    def get(self, key, default=None):
+        # Fused helpers return dicts; every fused section depends on the fused call's inputs, and the
+        # per-section fallbacks only run when the fused call fails, so they are not part of the plan
+        return ProbeValue(self)
+
+
+class DependencyProbe:
+    """
+    Replaces an agent's helper to record which input fields reach each helper prompt.
+
+    Every input field is set to a unique sentinel. A helper call depends on the
+    fields whose sentinels appear in its arguments; its result carries those
+    sentinels on, so dependencies through earlier outputs are followed too.
+    """
+
+    def __init__(self, sentinels):
+        self.sentinels = sentinels
+        self.dependencies = {}
+
+    def __getattr__(self, name):
+        def probe(*args, **kwargs):
+            arguments = repr(args) + repr(kwargs)
+            fields = {field for field, sentinel in self.sentinels.items() if sentinel in arguments}
+            self.dependencies.setdefault(name, set()).update(fields)
+            return ProbeValue(" ".join(self.sentinels[field] for field in sorted(fields)))
+        return probe
+
+
+def probe_dependencies(agent):
+    """
+    Returns ``{helper method: sorted input fields}`` for an agent by running it against a DependencyProbe.
+    """
+    sentinels = {field: f"<<{field}>>" for field in INPUT_FIELDS}
+    probe = DependencyProbe(sentinels)
+    helper = agent.helper
+    agent.helper = probe
+    try:
+        agent.process(input_data=dict(sentinels))
+    finally:
+        agent.helper = helper
+    return {method: sorted(fields) for method, fields in probe.dependencies.items()}
+
+
+class SharedHelper:
+    """
+    Wraps an agent's helper so identical sub-prompts across variants run once.
+
+    Calls are keyed by method and arguments, which are exactly the inputs the
+    prompt depends on; concurrent variants asking for the same key wait for
+    the first call instead of sending a duplicate.
+
+    The call runs in the scope of the variants expected to use it (those
+    agreeing on the method's probed input fields), so budgets apply while it
+    runs. Results are shared by actual arguments, though, so ``settle`` later
+    moves each call's charges onto the variants that actually used it.
+    """
+
+    def __init__(self, helper, dependencies=None, variants=None):
+        self._helper = helper
+        self._dependencies = dependencies or {}
+        self._variants = variants or {}
+        self._results = {}
+        self._locks = {}
+        self._charges = {}
+        self._used_by = {}
+        self._lock = threading.Lock()
+        self.calls = {}
+
+    def __getattr__(self, name):
+        method = getattr(self._helper, name)
+        if not callable(method):
+            return method
+
+        def shared(*args, **kwargs):
+            key = (name, repr(args), repr(sorted(kwargs.items())))
+            with self._lock:
+                key_lock = self._locks.setdefault(key, threading.Lock())
+            caller = current_idea.get()
+            with key_lock:
+                if key not in self._results:
+                    consumers, charges = self._consumers(name), []
+                    token = current_charges.set(charges)
+                    try:
+                        with idea_scope(consumers):
+                            self._results[key] = method(*args, **kwargs)
+                    finally:
+                        current_charges.reset(token)
+                    with self._lock:
+                        self.calls[name] = self.calls.get(name, 0) + 1
+                        self._charges[key] = (consumers, charges)
+                with self._lock:
+                    self._used_by.setdefault(key, set()).add(caller)
+                return self._results[key]
+        return shared
+
+    def settle(self, ledger):
+        """
+        Moves every shared call's charges from the variants expected to use it onto those that did.
+        """
+        with self._lock:
+            for key, (consumers, charges) in self._charges.items():
+                used_by = tuple(sorted(self._used_by.get(key, ())))
+                expected = consumers if isinstance(consumers, tuple) else (consumers,)
+                if not used_by or set(used_by) == set(expected):
+                    continue
+                for charge in charges:
+                    ledger.reassign(consumers, used_by, *charge)
+
+    def _consumers(self, name):
+        caller = current_idea.get()
+        fields = self._dependencies.get(name)
+        variant = self._variants.get(caller)
+        if fields is None or variant is None:
+            return caller
+        return tuple(
+            idea_id for idea_id, other in self._variants.items()
+            if all(other[field] == variant[field] for field in fields)
+        )
+
+
+def build_variants(industries, business_models, company_sizes):
+    return [
+        {
+            "industry": industry,
+            "business_model": business_model,
+            "business_model_type": business_model,
+            "company_size": company_size,
+        }
+        for industry, business_model, company_size in itertools.product(industries, business_models, company_sizes)
+    ]
+
+
+def variant_id(base_id, variant):
+    slug = "_".join(
+        str(variant[field]).replace(" ", "-") for field in ("industry", "business_model", "company_size")
+    )
+    return f"{base_id}__{slug}"
+
+
+def plan_calls(dependencies, variants):
+    """
+    Counts, per helper prompt, the unique calls a sweep needs: one per distinct combination of its inputs.
+    """
+    plan = {}
+    for agent_type, methods in dependencies.items():
+        for method, fields in methods.items():
+            unique = {tuple(variant[field] for field in fields) for variant in variants}
+            plan[f"{agent_type}.{method}"] = {"depends_on": fields, "unique_calls": len(unique)}
+    return plan
+
+
+def build_comparison(variants, variant_ids, storage, ledger):
+    """
+    Renders a Markdown table comparing every variant's section status and spend.
+
+    Sub-prompts shared by several variants are charged in equal parts to each variant that used them.
+    """
+    headers = ["Industry", "Business Model", "Company Size", "Idea ID"] + list(SECTION_AGENTS) + ["Tokens", "Cost"]
+    rows = ["| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    for variant, idea_id in zip(variants, variant_ids):
+        statuses = storage.section_status(idea_id)
+        total = ledger.usage_for(idea_id)["total"]
+        cells = [variant["industry"], variant["business_model"], variant["company_size"], idea_id]
+        cells += [statuses.get(agent_type, "missing") for agent_type in SECTION_AGENTS]
+        cells += [str(total["prompt_tokens"] + total["completion_tokens"]), f"${total['cost']:.4f}"]
+        rows.append("| " + " | ".join(cells) + " |")
+    return "\n".join(rows) + "\n"
+
+
+def run_sweep(config, storage, base_id, variants, with_reports=True):
+    logger = logging.getLogger(__name__)
+    agents = {
+        agent_type: agent_class(config_path='config/config.yaml')
+        for agent_type, agent_class in SECTION_AGENTS.items()
+    }
+
+    dependencies = {agent_type: probe_dependencies(agent) for agent_type, agent in agents.items()}
+    plan = plan_calls(dependencies, variants)
+    naive_calls = len(variants) * len(plan)
+    planned_calls = sum(entry["unique_calls"] for entry in plan.values())
+    logger.info(f"Sweep plan: {json.dumps(plan)}")
+    logger.info(f"Sweep of {len(variants)} variants needs at most {planned_calls} sub-prompts "
+                f"instead of {naive_calls}")
+
+    variant_ids = [variant_id(base_id, variant) for variant in variants]
+    variants_by_id = dict(zip(variant_ids, variants))
+    for agent_type, agent in agents.items():
+        agent.helper = SharedHelper(agent.helper, dependencies[agent_type], variants_by_id)
+
+    for variant, idea_id in zip(variants, variant_ids):
+        storage.store_metadata(variant, idea_id)
+        storage.begin_run(idea_id, list(SECTION_AGENTS) + (["ComprehensiveReport"] if with_reports else []))
+
+    def run_section(agent_type, variant, idea_id):
+        with idea_scope(idea_id):
+            analysis = agents[agent_type].process(input_data=variant)
+        status = READY if isinstance(analysis, AnalysisResult) else FAILED
+        if status == READY and take_degraded(idea_id, agent_type):
+            status = DEGRADED
+        storage.store_output(agent_type=agent_type, output_data=analysis, idea_id=idea_id, status=status)
+
+    max_workers = config['langgraph'].get('resources', {}).get('max_workers', 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_section, agent_type, variant, idea_id)
+            for variant, idea_id in zip(variants, variant_ids)
+            for agent_type in SECTION_AGENTS
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    if with_reports:
+        generalized_agent = GeneralizedAgent(config_path='config/config.yaml')
+        for idea_id in variant_ids:
+            with idea_scope(idea_id):
+                report = generalized_agent.process(storage, idea_id)
+            status = DEGRADED if take_degraded(idea_id, "ComprehensiveReport") else READY
+            storage.store_output(agent_type="ComprehensiveReport", output_data=report, idea_id=idea_id, status=status)
+
+    ledger = get_ledger(config.get('llm', {}).get('budgets'))
+    for agent in agents.values():
+        agent.helper.settle(ledger)
+    for idea_id in variant_ids:
+        storage.store_usage(ledger.usage_for(idea_id), idea_id)
+
+    executed = {
+        f"{agent_type}.{method}": count
+        for agent_type, agent in agents.items() for method, count in agent.helper.calls.items()
+    }
+    logger.info(f"Sweep executed {sum(executed.values())} sub-prompts: {json.dumps(executed)}")
+
+    comparison = build_comparison(variants, variant_ids, storage, ledger)
+    storage.store_sweep(base_id, comparison)
+    return comparison, planned_calls, naive_calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze one idea across a grid of input variants")
+    parser.add_argument("--idea-id", required=True, help="Base idea ID; each variant is stored as <idea-id>__<variant>")
+    parser.add_argument("--industry", nargs="+", required=True)
+    parser.add_argument("--business-model", nargs="+", required=True)
+    parser.add_argument("--company-size", nargs="+", required=True)
+    parser.add_argument("--no-reports", action="store_true", help="Skip the per-variant comprehensive reports")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    with open('config/config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+    setup_logging(config)
+
+    variants = build_variants(args.industry, args.business_model, args.company_size)
+    comparison, planned_calls, naive_calls = run_sweep(
+        config, Storage(), args.idea_id, variants, with_reports=not args.no_reports
+    )
+    print(f"----- Sweep of {len(variants)} variants: {planned_calls} sub-prompts planned "
+          f"(vs {naive_calls} without sharing) -----")
+    print(comparison)
+
+
+if __name__ == "__main__":
+    main()